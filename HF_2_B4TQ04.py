@@ -1,5 +1,51 @@
+from array import array
+
+# kompakt racs: a terkep egyetlen lapos bajtpufferben, a cellakat egesz index azonositja
+# index = row * stride + col
+# parse_grid(compact=True) eseten stride == cols, a rovidebb sorokat PAD bajttal toltjuk ki
+# (ez a griden kivuli teruletnek szamit); memoria-lekepezett fajlnal stride a sorvege
+# karakterekkel egyutt ertendo, igy a sorvegek maguk is "falkent" viselkednek
+PAD = 0
+WALL = ord("#")
+
+class CompactGrid:
+    __slots__ = ("cells", "rows", "cols", "stride", "masks")
+
+    def __init__(self, cells, rows, cols, stride=None):
+        self.cells = cells  # bajtpuffer (bytearray / memoryview), legalabb rows * stride meretu
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols if stride is None else stride
+        self.masks = None  # szomszed-bitmaszkok, lustan szamolva (neighbour_masks)
+
+    def index(self, row, col):
+        return row * self.stride + col
+
+    def position(self, idx):
+        return divmod(idx, self.stride)
+
+    # karakter elso elofordulasanak indexe (-1, ha nincs ilyen)
+    def find(self, ch):
+        return self.cells.find(ord(ch))
+
+# bajt -> bejarhato-e tablazat: fal, kitoltes es sorvege nem bejarhato
+FREE_TABLE = bytes(0 if b in (PAD, WALL, ord("\n"), ord("\r")) else 1 for b in range(256))
+
+# tobbsoros stringbol kompakt racsot keszit
+def parse_compact_grid(input_grid):
+    lines = [line.encode("latin-1") for line in input_grid.splitlines() if len(line) > 0]
+    rows = len(lines)
+    cols = max((len(line) for line in lines), default=0)
+    cells = bytearray(rows * cols)  # PAD = 0 -val inicializalva
+    for row, line in enumerate(lines):
+        cells[row * cols:row * cols + len(line)] = line
+    return CompactGrid(cells, rows, cols)
+
 # tobbsoros stringbol 2D racsot keszit
-def parse_grid(input_grid):
+# compact=True eseten CompactGrid-et ad vissza listak listaja helyett
+def parse_grid(input_grid, compact=False):
+    if compact:
+        return parse_compact_grid(input_grid)
     grid = []
     for line in input_grid.splitlines():
         if len(line) == 0:
@@ -10,32 +56,113 @@ def parse_grid(input_grid):
         grid.append(row)
     return grid
 
+import mmap
+
+# memoria-lekepezett terkepfajl: a cellak kozvetlenul a fajl lapjairol olvasodnak, masolat nelkul
+# mm: a lekepezes, base: az elso nem ures sor kezdete, row_offsets: sorkezdetek a fajlban
+class MappedGrid(CompactGrid):
+    __slots__ = ("mm", "base", "row_offsets", "path")
+
+    def find(self, ch):
+        idx = self.mm.find(ch.encode("latin-1"), self.base)
+        return -1 if idx < 0 else idx - self.base
+
+    def close(self):
+        self.cells.release()
+        self.mm.close()
+
+# nagy ASCII terkep betoltese fajlbol mmap-pel
+# a sorkezdeteket egyetlen menetben keressuk meg (mmap.find a sorvegekre),
+# az ures sorokat - parse_grid-hez hasonloan - kihagyjuk
+# a sorok hossza meg kell egyezzen, kulonben nem lehet egyenletes indexelest hasznalni
+def load_grid_mmap(path):
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    size = len(mm)
+    row_offsets = array("q")
+    cols = None
+    pos = 0
+    while pos < size:
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            nl = size
+        end = nl
+        if end > pos and mm[end - 1] == 13:  # CRLF sorvege
+            end -= 1
+        if end > pos:
+            if cols is None:
+                cols = end - pos
+            elif end - pos != cols:
+                mm.close()
+                raise ValueError(f"{path}: a(z) {len(row_offsets) + 1}. sor hossza {end - pos}, elvart: {cols}")
+            row_offsets.append(pos)
+        pos = nl + 1
+
+    rows = len(row_offsets)
+    if rows == 0:
+        mm.close()
+        raise ValueError(f"{path}: ures terkep")
+    stride = row_offsets[1] - row_offsets[0] if rows > 1 else size - row_offsets[0]
+    for i in range(1, rows):
+        if row_offsets[i] - row_offsets[i - 1] != stride:
+            mm.close()
+            raise ValueError(f"{path}: ures sor a terkep belsejeben (a(z) {i + 1}. sor elott)")
+
+    base = row_offsets[0]
+    grid = MappedGrid(memoryview(mm)[base:base + rows * stride], rows, cols, stride)
+    grid.mm = mm
+    grid.base = base
+    grid.row_offsets = row_offsets
+    grid.path = path
+    return grid
+
+# listak listajakent tarolt racs (parse_grid) atalakitasa kompakt racsca
+def to_compact_grid(grid):
+    if isinstance(grid, CompactGrid):
+        return grid
+    return parse_compact_grid("\n".join("".join(row) for row in grid))
+
 # inputban kapott karakter megkeresese egy 2D gridben
 # elofeltetel: parse_grid(grid)
 def find_char(grid, ch):
+    if isinstance(grid, CompactGrid):
+        idx = grid.find(ch)
+        if idx < 0:
+            return None
+        return grid.position(idx)
     for row in range(len(grid)):
         for col in range(len(grid[row])):
             if grid[row][col] == ch:
                 return (row, col) # megtalalt karakter pozicioja
         
+# tobb karakter (pl. "S" es "G") megkeresese egyszerre
+# kompakt / mmap racson C-szintu bajtkeresessel, nem soronkenti Python ciklussal
+def find_chars(grid, chars):
+    return {ch: find_char(grid, ch) for ch in chars}
+
 # ellenorzi, hogy a grid hatarain belul vagyunk-e (szomszedok ellenorzesenel lesz hasznos)
 def is_inside_grid_boundaries(grid, row, col):
+    if isinstance(grid, CompactGrid):
+        return 0 <= row < grid.rows and 0 <= col < grid.cols and grid.cells[grid.index(row, col)] != PAD
     return 0 <= row < len(grid) and 0 <= col < len(grid[row])
 
 # ellenorzi, hogy nem utkoztunk-e falba
 def is_not_wall(grid, row, col):
+    if isinstance(grid, CompactGrid):
+        return grid.cells[grid.index(row, col)] != WALL
     return grid[row][col] != "#"
 
 # aktualis poziciohoz kepest bal-jobb-fel-le szomszed
+DIRECTIONS = (
+    (-1, 0),  # fel
+    (1, 0),   # le
+    (0, -1),  # bal
+    (0, 1)    # jobb
+)
+
 def neighbours_4(grid, row, col):
     result = []
-    directions = [
-        (-1, 0),  # fel
-        (1, 0),   # le
-        (0, -1),  # bal
-        (0, 1)    # jobb
-    ]
-    for row_direction, col_direction in directions:
+    for row_direction, col_direction in DIRECTIONS:
         new_row = row + row_direction
         new_col = col + col_direction
         
@@ -45,9 +172,36 @@ def neighbours_4(grid, row, col):
 
     return result
 
+# kompakt racson: bejarhato szomszedok indexei, ugyanabban a sorrendben (fel, le, bal, jobb)
+def neighbours_4_index(grid, idx):
+    stride = grid.stride
+    cells = grid.cells
+    row, col = divmod(idx, stride)
+    result = []
+    if row > 0 and FREE_TABLE[cells[idx - stride]]:
+        result.append(idx - stride)
+    if row < grid.rows - 1 and FREE_TABLE[cells[idx + stride]]:
+        result.append(idx + stride)
+    if col > 0 and FREE_TABLE[cells[idx - 1]]:
+        result.append(idx - 1)
+    if col < grid.cols - 1 and FREE_TABLE[cells[idx + 1]]:
+        result.append(idx + 1)
+    return result
+
 # startbol celig vezeto ut (megoldas) eloallitasa
 # came_from: gyerek es szulo csucsok - honnan jottunk, hova jutottunk
-def reconstruct_path(came_from, start, goal):
+# kompakt racs eseten came_from egy szulo-index tomb, start es goal cellaindexek,
+# a visszaadott ut ekkor is (row, col) parokbol all
+def reconstruct_path(came_from, start, goal, stride=None):
+    if isinstance(came_from, array):
+        path = []
+        current = goal
+        while current != start:
+            path.append(divmod(current, stride))
+            current = came_from[current]
+        path.append(divmod(start, stride))
+        path.reverse()
+        return path
     path = []
     current = goal
     while current != start:
@@ -61,6 +215,17 @@ def reconstruct_path(came_from, start, goal):
 # az utat * (csillag) karakter jeloli
 import copy
 def render_path(grid, path):
+    if isinstance(grid, CompactGrid):
+        cells = bytearray(grid.cells)
+        for path_row, path_column in path:
+            idx = grid.index(path_row, path_column)
+            if cells[idx] not in b"SG":
+                cells[idx] = ord("*")
+        lines = []
+        for row in range(grid.rows):
+            line = cells[row * grid.stride:row * grid.stride + grid.cols].rstrip(b"\0")
+            lines.append(line.decode("latin-1"))
+        return "\n".join(lines)
     grid_copy = copy.deepcopy(grid)
     for i in range(len(path)):
         path_row = path[i][0]
@@ -79,6 +244,8 @@ def manhattan_distance(a, b):
 
 import heapq
 def a_star_algorithm(grid, start, goal):
+    if isinstance(grid, CompactGrid):
+        return a_star_compact(grid, start, goal)
     open_heap = []
     counter = 0
 
@@ -124,8 +291,927 @@ def a_star_algorithm(grid, start, goal):
     # ha kifogyott a nyílt halmaz és nem találtuk meg a célt
     return None
 
+# A* a kompakt racson
+# ugyanaz a kiterjesztesi sorrend es holtverseny-feloldas (f, counter), mint a fenti
+# valtozatban, igy az eredmeny utvonal is pontosan ugyanaz
+# g_score es came_from elore lefoglalt tombok, a closed_set egy bitterkep
+# stats: opcionalis szotar, ide kerul a kiterjesztett csucsok szama ("expanded")
+def a_star_compact(grid, start, goal, stats=None):
+    rows, cols, stride = grid.rows, grid.cols, grid.stride
+    cells = grid.cells
+    free = FREE_TABLE
+    n = rows * stride
+    start_idx = start[0] * stride + start[1]
+    goal_idx = goal[0] * stride + goal[1]
+    goal_row, goal_col = goal
+
+    g_score = array("l", [-1]) * n  # -1: meg nem ertuk el
+    came_from = array("l", [-1]) * n
+    closed = bytearray((n + 7) >> 3)
+
+    g_score[start_idx] = 0
+    open_heap = [(manhattan_distance(start, goal), 0, start_idx)]
+    counter = 1
+    expanded = 0
+
+    while open_heap:
+        current_f, _, current = heapq.heappop(open_heap)
+
+        if current == goal_idx:
+            if stats is not None:
+                stats["expanded"] = expanded
+            return reconstruct_path(came_from, start_idx, goal_idx, stride)
+
+        if closed[current >> 3] & (1 << (current & 7)):
+            continue
+        closed[current >> 3] |= 1 << (current & 7)
+        expanded += 1
+
+        row, col = divmod(current, stride)
+        tentative_g = g_score[current] + 1  # minden lepes koltsege 1
+
+        # fel, le, bal, jobb - ugyanaz a sorrend, mint neighbours_4-ben
+        for neighbor, ok, n_row, n_col in (
+            (current - stride, row > 0, row - 1, col),
+            (current + stride, row < rows - 1, row + 1, col),
+            (current - 1, col > 0, row, col - 1),
+            (current + 1, col < cols - 1, row, col + 1),
+        ):
+            if not ok or not free[cells[neighbor]]:
+                continue
+            if closed[neighbor >> 3] & (1 << (neighbor & 7)):
+                continue
+            old_g = g_score[neighbor]
+            if old_g < 0 or tentative_g < old_g:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                f = tentative_g + abs(n_row - goal_row) + abs(n_col - goal_col)
+                heapq.heappush(open_heap, (f, counter, neighbor))
+                counter += 1
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    return None
+
+# cellankenti szomszed-bitmaszk: melyik iranyba lehet lepni (griden belul, nem falba)
+# a bitek a DIRECTIONS sorrendjeben: fel, le, bal, jobb
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+# a maszkot egyszer szamoljuk ki a teljes racsra, nagy egesz szamokon vegzett
+# bajtonkenti eltolasokkal (cellankent egy bajt, ertekei 0/1), Python ciklus nelkul
+def neighbour_masks(grid):
+    if grid.masks is not None:
+        return grid.masks
+    rows, cols, stride = grid.rows, grid.cols, grid.stride
+    n = rows * stride
+    free = int.from_bytes(bytes(grid.cells[:n]).translate(FREE_TABLE).ljust(n, b"\0"), "little")
+    # sorvegeken ne lepjunk at a szomszedos sorba
+    not_first_col = int.from_bytes((b"\0" + b"\1" * (cols - 1) + b"\0" * (stride - cols)) * rows, "little")
+    not_last_col = int.from_bytes((b"\1" * (cols - 1) + b"\0" * (stride - cols + 1)) * rows, "little")
+    up = free << (8 * stride)
+    down = free >> (8 * stride)
+    left = (free << 8) & not_first_col
+    right = (free >> 8) & not_last_col
+    masks = up | (down << 1) | (left << 2) | (right << 3)
+    grid.masks = bytearray(masks.to_bytes(n + stride + 1, "little")[:n])
+    return grid.masks
+
+# A* az elore kiszamolt szomszed-bitmaszkkal: nincs hatarellenorzes es lista-foglalas csucsonkent
+# a kiterjesztesi sorrend ugyanaz, mint a_star_compact-ban, igy az utvonal is ugyanaz
+def a_star_masked(grid, start, goal, stats=None):
+    stride = grid.stride
+    masks = neighbour_masks(grid)
+    n = grid.rows * stride
+    start_idx = start[0] * stride + start[1]
+    goal_idx = goal[0] * stride + goal[1]
+    goal_row, goal_col = goal
+
+    g_score = array("l", [-1]) * n
+    came_from = array("l", [-1]) * n
+    closed = bytearray((n + 7) >> 3)
+    steps = ((UP, -stride, -1, 0), (DOWN, stride, 1, 0), (LEFT, -1, 0, -1), (RIGHT, 1, 0, 1))
+
+    g_score[start_idx] = 0
+    open_heap = [(manhattan_distance(start, goal), 0, start_idx)]
+    counter = 1
+    expanded = 0
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+
+        if current == goal_idx:
+            if stats is not None:
+                stats["expanded"] = expanded
+            return reconstruct_path(came_from, start_idx, goal_idx, stride)
+
+        if closed[current >> 3] & (1 << (current & 7)):
+            continue
+        closed[current >> 3] |= 1 << (current & 7)
+        expanded += 1
+
+        mask = masks[current]
+        row, col = divmod(current, stride)
+        # a heurisztika szomszedonkent csak egy lepessel valtozik: sor/oszlop tavolsag elore
+        d_row = row - goal_row
+        d_col = col - goal_col
+        tentative_g = g_score[current] + 1
+
+        for bit, step, row_step, col_step in steps:
+            if not mask & bit:
+                continue
+            neighbor = current + step
+            if closed[neighbor >> 3] & (1 << (neighbor & 7)):
+                continue
+            old_g = g_score[neighbor]
+            if old_g < 0 or tentative_g < old_g:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                f = tentative_g + abs(d_row + row_step) + abs(d_col + col_step)
+                heapq.heappush(open_heap, (f, counter, neighbor))
+                counter += 1
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    return None
+
+# Jump Point Search 4-szomszedos racsra
+# vizszintes mozgasnal addig ugrunk, amig egy fuggoleges szomszed "kenyszerito" nem lesz
+# (elottunk fal volt mellette, most nincs), fuggoleges mozgasnal pedig minden lepesben
+# megnezzuk, indul-e onnan vizszintes ugras - igy csak az ugrasi pontok kerulnek a nyilt halmazba
+def _jump_horizontal(masks, current, step, direction, goal, scanned):
+    while True:
+        scanned[0] += 1
+        if current == goal:
+            return current
+        mask = masks[current]
+        behind = masks[current - step]
+        if (mask & UP and not behind & UP) or (mask & DOWN and not behind & DOWN):
+            return current
+        if not mask & direction:
+            return -1
+        current += step
+
+def _jump_vertical(masks, current, step, direction, goal, scanned):
+    while True:
+        scanned[0] += 1
+        if current == goal:
+            return current
+        mask = masks[current]
+        behind = masks[current - step]
+        if (mask & LEFT and not behind & LEFT) or (mask & RIGHT and not behind & RIGHT):
+            return current
+        if mask & LEFT and _jump_horizontal(masks, current - 1, -1, LEFT, goal, scanned) >= 0:
+            return current
+        if mask & RIGHT and _jump_horizontal(masks, current + 1, 1, RIGHT, goal, scanned) >= 0:
+            return current
+        if not mask & direction:
+            return -1
+        current += step
+
+def jump_point_search(grid, start, goal, stats=None):
+    stride = grid.stride
+    masks = neighbour_masks(grid)
+    n = grid.rows * stride
+    start_idx = start[0] * stride + start[1]
+    goal_idx = goal[0] * stride + goal[1]
+    goal_row, goal_col = goal
+    steps = {UP: -stride, DOWN: stride, LEFT: -1, RIGHT: 1}
+
+    g_score = array("l", [-1]) * n
+    came_from = array("l", [-1]) * n
+    closed = bytearray((n + 7) >> 3)
+    scanned = [0]  # az ugrasok soran erintett cellak szama
+
+    g_score[start_idx] = 0
+    open_heap = [(manhattan_distance(start, goal), 0, start_idx)]
+    counter = 1
+    expanded = 0
+    found = False
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if current == goal_idx:
+            found = True
+            break
+        if closed[current >> 3] & (1 << (current & 7)):
+            continue
+        closed[current >> 3] |= 1 << (current & 7)
+        expanded += 1
+
+        mask = masks[current]
+        # metszett iranyok: a szulotol valo erkezes iranya alapjan
+        if current == start_idx:
+            directions = mask
+        else:
+            delta = current - came_from[current]
+            if abs(delta) < stride:  # vizszintesen erkeztunk
+                directions = mask & (UP | DOWN | (RIGHT if delta > 0 else LEFT))
+            else:
+                directions = mask & (LEFT | RIGHT | (DOWN if delta > 0 else UP))
+
+        row, col = divmod(current, stride)
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            if not directions & direction:
+                continue
+            step = steps[direction]
+            if direction & (LEFT | RIGHT):
+                jump = _jump_horizontal(masks, current + step, step, direction, goal_idx, scanned)
+            else:
+                jump = _jump_vertical(masks, current + step, step, direction, goal_idx, scanned)
+            if jump < 0 or closed[jump >> 3] & (1 << (jump & 7)):
+                continue
+            j_row, j_col = divmod(jump, stride)
+            tentative_g = g_score[current] + abs(j_row - row) + abs(j_col - col)
+            old_g = g_score[jump]
+            if old_g < 0 or tentative_g < old_g:
+                came_from[jump] = current
+                g_score[jump] = tentative_g
+                f = tentative_g + abs(j_row - goal_row) + abs(j_col - goal_col)
+                heapq.heappush(open_heap, (f, counter, jump))
+                counter += 1
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["scanned"] = scanned[0]
+    if not found:
+        return None
+
+    # ugrasi pontok kozotti egyenes szakaszok kibontasa cellankenti utta
+    jump_points = reconstruct_path(came_from, start_idx, goal_idx, stride)
+    path = [jump_points[0]]
+    for (row, col), (next_row, next_col) in zip(jump_points, jump_points[1:]):
+        row_step = (next_row > row) - (next_row < row)
+        col_step = (next_col > col) - (next_col < col)
+        while (row, col) != (next_row, next_col):
+            row += row_step
+            col += col_step
+            path.append((row, col))
+    return path
+
+# valaszthato utvonaltervezok
+PLANNERS = {
+    "astar": a_star_compact,
+    "astar_mask": a_star_masked,
+    "jps": jump_point_search,
+}
+
+# utvonaltervezes a kivalasztott tervezovel; mindharom optimalis hosszusagu utat ad
+# (astar es astar_mask pontosan a_star_algorithm utjat, jps egy azonos hosszut)
+def find_path(grid, start, goal, planner="astar", stats=None):
+    if planner not in PLANNERS:
+        raise ValueError(f"ismeretlen tervezo: {planner} (lehetseges: {', '.join(PLANNERS)})")
+    return PLANNERS[planner](to_compact_grid(grid), start, goal, stats)
+
+
+# inkrementalis ujratervezes (LPA*) valtozo racson
+# a planner a racs egy sajat, irhato peldanyat tartja, a start es a cel rogzitett
+# update() cellavaltozasokat (row, col, wall) fogad, es csak az erintett csucsokat
+# dolgozza fel ujra; a g es rhs ertekek a hivasok kozott megmaradnak
+# stats: "updated" - ujraszamolt rhs ertekek, "expanded" - kiterjesztett csucsok
+INF = 1 << 60
+
+class IncrementalPlanner:
+    def __init__(self, grid, start, goal):
+        # sajat masolat: update() nem irhat a hivo racsaba (es nem torolheti annak masks-at)
+        grid = to_compact_grid(grid)
+        grid = CompactGrid(bytearray(grid.cells), grid.rows, grid.cols, grid.stride)
+        self.grid = grid
+        self.start = start[0] * grid.stride + start[1]
+        self.goal = goal[0] * grid.stride + goal[1]
+        n = grid.rows * grid.stride
+        self.g = array("q", [INF]) * n
+        self.rhs = array("q", [INF]) * n
+        self.rhs[self.start] = 0
+        self.open_heap = [(manhattan_distance(start, goal), 0, self.start)]
+        self.stats = {"updated": 0, "expanded": 0}
+        self._compute_shortest_path()
+
+    def _neighbours(self, idx):
+        grid = self.grid
+        stride = grid.stride
+        row, col = divmod(idx, stride)
+        result = []
+        if row > 0:
+            result.append(idx - stride)
+        if row < grid.rows - 1:
+            result.append(idx + stride)
+        if col > 0:
+            result.append(idx - 1)
+        if col < grid.cols - 1:
+            result.append(idx + 1)
+        return result
+
+    def _key(self, idx):
+        best = min(self.g[idx], self.rhs[idx])
+        row, col = divmod(idx, self.grid.stride)
+        goal_row, goal_col = divmod(self.goal, self.grid.stride)
+        return (best + abs(row - goal_row) + abs(col - goal_col), best)
+
+    def _update_vertex(self, idx):
+        cells = self.grid.cells
+        if idx != self.start:
+            best = INF
+            if FREE_TABLE[cells[idx]]:
+                g = self.g
+                for neighbor in self._neighbours(idx):
+                    # falbol csak a startbol lephetunk ki
+                    if g[neighbor] + 1 < best and (FREE_TABLE[cells[neighbor]] or neighbor == self.start):
+                        best = g[neighbor] + 1
+            self.rhs[idx] = best
+            self.stats["updated"] += 1
+        if self.g[idx] != self.rhs[idx]:
+            k1, k2 = self._key(idx)
+            heapq.heappush(self.open_heap, (k1, k2, idx))
+
+    def _compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        goal = self.goal
+        open_heap = self.open_heap
+        while open_heap and ((open_heap[0][0], open_heap[0][1]) < self._key(goal) or rhs[goal] != g[goal]):
+            k1, k2, idx = heapq.heappop(open_heap)
+            if g[idx] == rhs[idx]:
+                continue  # elavult bejegyzes
+            new_key = self._key(idx)
+            if (k1, k2) < new_key:
+                heapq.heappush(open_heap, (new_key[0], new_key[1], idx))
+                continue
+            self.stats["expanded"] += 1
+            if g[idx] > rhs[idx]:
+                g[idx] = rhs[idx]
+            else:
+                g[idx] = INF
+                self._update_vertex(idx)
+            for neighbor in self._neighbours(idx):
+                self._update_vertex(neighbor)
+
+    # cellak valtoztatasa es az ut javitasa
+    # changes: (row, col, wall) harmasok, wall=True -> "#", wall=False -> "."
+    # a start es a cel cellajat (es az S / G jeloleseket) nem irjuk felul, ezeket a valtozasokat kihagyjuk
+    def update(self, changes):
+        self.stats = {"updated": 0, "expanded": 0}
+        grid = self.grid
+        changed = []
+        for row, col, wall in changes:
+            idx = grid.index(row, col)
+            new_cell = WALL if wall else ord(".")
+            if idx == self.start or idx == self.goal or grid.cells[idx] in b"SG":
+                continue
+            if grid.cells[idx] != new_cell:
+                grid.cells[idx] = new_cell
+                changed.append(idx)
+        if changed:
+            grid.masks = None  # a szomszed-bitmaszkok elavultak
+        for idx in changed:
+            self._update_vertex(idx)
+            for neighbor in self._neighbours(idx):
+                self._update_vertex(neighbor)
+        self._compute_shortest_path()
+        return self.path()
+
+    # az aktualis legrovidebb ut a g ertekek menten visszafele kovetve (None, ha nincs)
+    def path(self):
+        g = self.g
+        cells = self.grid.cells
+        if g[self.goal] >= INF:
+            return None
+        stride = self.grid.stride
+        path = [divmod(self.goal, stride)]
+        current = self.goal
+        while current != self.start:
+            best = None
+            for neighbor in self._neighbours(current):
+                if g[neighbor] + 1 == g[current] and (FREE_TABLE[cells[neighbor]] or neighbor == self.start):
+                    best = neighbor
+                    break
+            current = best
+            path.append(divmod(current, stride))
+        path.reverse()
+        return path
+
+# egy forrasbol inditott szelessegi kereses (egysegnyi lepeskoltseg mellett = Dijkstra)
+# a keresofa (szulo-index tomb) az osszes celhoz kozos, a kereses leall, ha minden celt elert
+# goals: cellaindexek halmaza
+def bfs_tree(grid, source, goals):
+    rows, cols, stride = grid.rows, grid.cols, grid.stride
+    cells = grid.cells
+    free = FREE_TABLE
+    came_from = array("l", [-1]) * (rows * stride)
+    came_from[source] = source
+    remaining = set(goals)
+    remaining.discard(source)
+    queue = array("l", [source])
+    head = 0
+    while head < len(queue) and remaining:
+        current = queue[head]
+        head += 1
+        row, col = divmod(current, stride)
+        # fel, le, bal, jobb
+        if row > 0:
+            neighbor = current - stride
+            if came_from[neighbor] < 0 and free[cells[neighbor]]:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                remaining.discard(neighbor)
+        if row < rows - 1:
+            neighbor = current + stride
+            if came_from[neighbor] < 0 and free[cells[neighbor]]:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                remaining.discard(neighbor)
+        if col > 0:
+            neighbor = current - 1
+            if came_from[neighbor] < 0 and free[cells[neighbor]]:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                remaining.discard(neighbor)
+        if col < cols - 1:
+            neighbor = current + 1
+            if came_from[neighbor] < 0 and free[cells[neighbor]]:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                remaining.discard(neighbor)
+    return came_from
+
+# egy forras osszes celjanak megoldasa
+# exact=True: celonkent a_star_compact, igy minden ut pontosan ugyanaz, mint a_star_algorithm-nal
+# (a holtverseny-feloldas a heurisztikan, tehat a celon is mulik); az ismetlodo celokat csak egyszer oldjuk meg
+# exact=False: egyetlen kozos BFS-fa az osszes celhoz - az utak hossza optimalis (ugyanaz, mint A*-nal),
+# de azonos hosszu utak kozott mas utvonalat valaszthat; sok cel eseten joval gyorsabb
+def solve_source(grid, start, goals, exact=True):
+    if not exact:
+        stride = grid.stride
+        source = start[0] * stride + start[1]
+        goal_indices = [goal[0] * stride + goal[1] for goal in goals]
+        came_from = bfs_tree(grid, source, goal_indices)
+        return [None if came_from[goal] < 0 else reconstruct_path(came_from, source, goal, stride)
+                for goal in goal_indices]
+    solved = {}
+    paths = []
+    for goal in goals:
+        if goal not in solved:
+            solved[goal] = a_star_compact(grid, start, goal)
+        paths.append(solved[goal])
+    return paths
+
+# legrovidebb tavolsagok egy forrasbol (None: elerhetetlen cel) a kozos BFS-fa alapjan
+# itt csak a hossz szamit, az utvonal holtverseny eseten elterhet az A* utjatol
+def source_distances(grid, start, goals):
+    stride = grid.stride
+    source = start[0] * stride + start[1]
+    goal_indices = [goal[0] * stride + goal[1] for goal in goals]
+    came_from = bfs_tree(grid, source, goal_indices)
+    distances = []
+    for goal in goal_indices:
+        if came_from[goal] < 0:
+            distances.append(None)
+            continue
+        steps = 0
+        current = goal
+        while current != source:
+            current = came_from[current]
+            steps += 1
+        distances.append(steps)
+    return distances
+
+# a process pool workerjei a racsot egyszer, az inicializalaskor kapjak meg
+# mmap racs eseten csak a fajl utvonalat, amit minden worker sajat maga lekepez
+_worker_grid = None
+
+def _grid_spec(grid):
+    if isinstance(grid, MappedGrid):
+        return ("mmap", grid.path)
+    return ("bytes", bytes(grid.cells), grid.rows, grid.cols, grid.stride)
+
+def _init_batch_worker(spec):
+    global _worker_grid
+    if spec[0] == "mmap":
+        _worker_grid = load_grid_mmap(spec[1])
+    else:
+        _worker_grid = CompactGrid(spec[1], spec[2], spec[3], spec[4])
+
+def _solve_source_in_worker(start, goals, exact):
+    return solve_source(_worker_grid, start, goals, exact)
+
+# sok (start, goal) par megoldasa ugyanazon a racson
+# a lekerdezeseket forras szerint csoportositjuk (egy feladat = egy forras osszes celja,
+# a racsot a workerek csak egyszer kapjak meg), a fuggetlen forrasokat process poolon osztjuk szet
+# exact: lasd solve_source - False eseten forrasonkent egyetlen kozos keresofa
+# az eredmeny a lekerdezesek sorrendjeben: utvonal vagy None
+def batch_paths(grid, queries, exact=True, workers=None):
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    grid = to_compact_grid(grid)
+    by_source = {}
+    for i, (start, goal) in enumerate(queries):
+        by_source.setdefault(start, []).append((i, goal))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(by_source))
+
+    results = [None] * len(queries)
+    groups = list(by_source.items())
+    if workers <= 1:
+        solved = (solve_source(grid, start, [goal for _, goal in items], exact) for start, items in groups)
+        for (start, items), paths in zip(groups, solved):
+            for (i, _), path in zip(items, paths):
+                results[i] = path
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(_grid_spec(grid),)) as pool:
+        futures = [pool.submit(_solve_source_in_worker, start, [goal for _, goal in items], exact)
+                   for start, items in groups]
+        for (start, items), future in zip(groups, futures):
+            for (i, _), path in zip(items, future.result()):
+                results[i] = path
+    return results
+
+# nagy terkep generalasa es mmap betoltes merese: betoltesi ido es csucs RSS
+# a terkep sorai width szelessegu veletlen racsok, S a bal felso, G a jobb also sarokban
+def benchmark_mmap_loader(path, size_mb=1024, width=32767):
+    import os
+    import random
+    import resource
+    import time
+
+    if not os.path.exists(path):
+        rng = random.Random(42)
+        pattern = bytes(rng.choices(b"....#", k=width * 64))
+        rows = max(2, size_mb * 2**20 // (width + 1))
+        with open(path, "wb") as fh:
+            for row in range(rows):
+                offset = rng.randrange(width * 63)
+                line = bytearray(pattern[offset:offset + width])
+                if row == 0:
+                    line[0] = ord("S")
+                if row == rows - 1:
+                    line[-1] = ord("G")
+                fh.write(line + b"\n")
+
+    t0 = time.perf_counter()
+    big_grid = load_grid_mmap(path)
+    t1 = time.perf_counter()
+    found = find_chars(big_grid, "SG")
+    t2 = time.perf_counter()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # linuxon KiB-ban
+
+    print(f"terkep: {path} ({os.path.getsize(path) / 2**20:.0f} MiB, {big_grid.rows} x {big_grid.cols})")
+    print(f"betoltes (mmap + sorkezdetek): {t1 - t0:.3f} s")
+    print(f"S/G keresese: {t2 - t1:.3f} s -> {found}")
+    print(f"csucs RSS: {peak_rss:.1f} MiB")
+    # az mmap-elt lapok fajl-alapuak (a kernel barmikor eldobhatja oket), az anonim resz a valodi masolat
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith(("RssAnon", "RssFile")):
+                    print(" - " + " ".join(line.split()))
+    big_grid.close()
 
-grid = r"""
+# hierarchikus absztrakcio (HPA*)
+# a racsot cluster_size x cluster_size meretu klaszterekre bontjuk, a szomszedos klaszterek
+# hataran levo atjarokbol bejarati csucsokat kepzunk, es klaszteren belul kiszamoljuk a
+# bejaratok kozotti tavolsagokat; a lekerdezes ezen a kis absztrakt grafon fut A*-gal,
+# majd csak a kivalasztott klasztereken belul finomitjuk az utat a_star_compact-tal
+# a csucsokat a tarolasi modtol fuggetlen pos = row * cols + col azonositja
+# az absztrakciot a terkep hash-evel kulcsolva lemezre mentjuk, felhasznalonkenti cache konyvtarba
+# ($XDG_CACHE_HOME vagy ~/.cache), nem vegrehajthato binaris formatumban (egyetlen int64 tomb, nem pickle):
+# fejlec [verzio, csucsok, elek, klaszterek, klasztercsucsok], majd csucsok, elszamok, el-celok, koltsegek,
+# klaszter (sor, oszlop) parok, klaszterenkenti csucsszamok es a klaszterek csucsai
+# HPA_CACHE_VERSION: a mentett formatum / epitesi logika verzioja, a kulcs resze - ha az absztrakcio
+# felepitese vagy a fajl formatuma valtozik, noveljuk, igy a regi cache fajlok nem toltodnek be
+HPA_CACHE_VERSION = 2
+
+def hpa_cache_dir():
+    import os
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "hpa_cache")
+
+class HierarchicalPlanner:
+    def __init__(self, grid, cluster_size=16):
+        self.grid = to_compact_grid(grid)
+        self.cluster_size = cluster_size
+        self.graph = {}  # pos -> [(pos, koltseg), ...]
+        self.cluster_nodes = {}  # (klaszter sor, klaszter oszlop) -> [pos, ...]
+
+    # a terkep tartalmat (kitoltes es sorvegek nelkul), a klasztermeretet es a cache verziot lefedo hash
+    def map_hash(self):
+        import hashlib
+
+        grid = self.grid
+        digest = hashlib.sha1(f"v{HPA_CACHE_VERSION}/{grid.rows}x{grid.cols}/{self.cluster_size}".encode())
+        for row in range(grid.rows):
+            start = grid.index(row, 0)
+            digest.update(grid.cells[start:start + grid.cols])
+        return digest.hexdigest()
+
+    # absztrakcio -> lapos int64 tomb (lasd fent a formatumot)
+    def _to_array(self):
+        graph, clusters = self.graph, self.cluster_nodes
+        edges = [edge for node in graph for edge in graph[node]]
+        n_cluster_nodes = sum(len(nodes) for nodes in clusters.values())
+        data = array("q", [HPA_CACHE_VERSION, len(graph), len(edges), len(clusters), n_cluster_nodes])
+        data.extend(graph)
+        data.extend(len(graph[node]) for node in graph)
+        data.extend(target for target, _ in edges)
+        data.extend(cost for _, cost in edges)
+        for cluster in clusters:
+            data.extend(cluster)
+        data.extend(len(nodes) for nodes in clusters.values())
+        for nodes in clusters.values():
+            data.extend(nodes)
+        return data
+
+    # lapos tombbol vissza; False, ha a tomb nem ervenyes (pl. csonka vagy mas verzioju)
+    def _from_array(self, data):
+        if len(data) < 5 or data[0] != HPA_CACHE_VERSION:
+            return False
+        n_nodes, n_edges, n_clusters, n_cluster_nodes = data[1:5]
+        if len(data) != 5 + 2 * n_nodes + 2 * n_edges + 3 * n_clusters + n_cluster_nodes:
+            return False
+        values = data.tolist()
+        pos = 5
+        nodes = values[pos:pos + n_nodes]; pos += n_nodes
+        counts = values[pos:pos + n_nodes]; pos += n_nodes
+        targets = values[pos:pos + n_edges]; pos += n_edges
+        costs = values[pos:pos + n_edges]; pos += n_edges
+        keys = values[pos:pos + 2 * n_clusters]; pos += 2 * n_clusters
+        cluster_counts = values[pos:pos + n_clusters]; pos += n_clusters
+        members = values[pos:]
+        graph = {}
+        i = 0
+        for node, count in zip(nodes, counts):
+            graph[node] = list(zip(targets[i:i + count], costs[i:i + count]))
+            i += count
+        cluster_nodes = {}
+        i = 0
+        for c, count in enumerate(cluster_counts):
+            cluster_nodes[(keys[2 * c], keys[2 * c + 1])] = members[i:i + count]
+            i += count
+        self.graph, self.cluster_nodes = graph, cluster_nodes
+        return True
+
+    # absztrakcio betoltese a gyorsitotarbol, vagy felepitese es mentese
+    # a cache konyvtar csak a felhasznaloe (0o700), mas tulajdonosu fajlt nem toltunk be
+    @classmethod
+    def load_or_build(cls, grid, cluster_size=16, cache_dir=None):
+        import os
+
+        planner = cls(grid, cluster_size)
+        if cache_dir is None:
+            cache_dir = hpa_cache_dir()
+        path = os.path.join(cache_dir, planner.map_hash() + ".hpa")
+        if os.path.exists(path) and (not hasattr(os, "getuid") or os.stat(path).st_uid == os.getuid()):
+            data = array("q")
+            with open(path, "rb") as fh:
+                raw = fh.read()
+            if len(raw) % data.itemsize == 0:
+                data.frombytes(raw)
+            if planner._from_array(data):
+                return planner
+        planner.build()
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # atomi csere: egy felbemaradt vagy parhuzamos iras ne hagyjon serult cache fajlt
+        tmp_path = path + f".{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            planner._to_array().tofile(fh)
+        os.replace(tmp_path, path)
+        return planner
+
+    def _is_free(self, row, col):
+        return FREE_TABLE[self.grid.cells[self.grid.index(row, col)]]
+
+    def _cluster_of(self, row, col):
+        return (row // self.cluster_size, col // self.cluster_size)
+
+    def _cluster_bounds(self, cluster):
+        size = self.cluster_size
+        row0, col0 = cluster[0] * size, cluster[1] * size
+        return row0, col0, min(row0 + size, self.grid.rows), min(col0 + size, self.grid.cols)
+
+    # a klaszter teglalapja sajat kompakt racskent (a klaszter hataran kivul minden PAD)
+    def _cluster_grid(self, cluster):
+        row0, col0, row1, col1 = self._cluster_bounds(cluster)
+        grid = self.grid
+        cells = bytearray()
+        for row in range(row0, row1):
+            cells += grid.cells[grid.index(row, col0):grid.index(row, col1)]
+        return CompactGrid(cells, row1 - row0, col1 - col0), row0, col0
+
+    def _add_edge(self, a, b, cost):
+        self.graph.setdefault(a, []).append((b, cost))
+        self.graph.setdefault(b, []).append((a, cost))
+
+    def _add_node(self, row, col):
+        pos = row * self.grid.cols + col
+        nodes = self.cluster_nodes.setdefault(self._cluster_of(row, col), [])
+        if pos not in nodes:
+            nodes.append(pos)
+            self.graph.setdefault(pos, [])
+        return pos
+
+    # atjarok ket szomszedos klaszter kozott: a hatar menti szabad cellaparok osszefuggo
+    # szakaszai; rovid szakaszbol a kozepen egy, hosszubol a ket vegen egy-egy atjaro
+    def _add_entrances(self, pairs):
+        segment = []
+        for pair in pairs + [None]:
+            if pair is not None and self._is_free(*pair[0]) and self._is_free(*pair[1]):
+                segment.append(pair)
+                continue
+            if segment:
+                chosen = [segment[len(segment) // 2]] if len(segment) < 6 else [segment[0], segment[-1]]
+                for a, b in chosen:
+                    self._add_edge(self._add_node(*a), self._add_node(*b), 1)
+                segment = []
+
+    def build(self):
+        grid, size = self.grid, self.cluster_size
+        self.graph = {}
+        self.cluster_nodes = {}
+        for boundary in range(size, grid.cols, size):
+            for row0 in range(0, grid.rows, size):
+                rows = range(row0, min(row0 + size, grid.rows))
+                self._add_entrances([((row, boundary - 1), (row, boundary)) for row in rows])
+        for boundary in range(size, grid.rows, size):
+            for col0 in range(0, grid.cols, size):
+                cols = range(col0, min(col0 + size, grid.cols))
+                self._add_entrances([((boundary - 1, col), (boundary, col)) for col in cols])
+
+        # klaszteren beluli tavolsagok a bejaratok kozott (egy BFS-fa bejaratonkent)
+        for cluster, nodes in self.cluster_nodes.items():
+            self._connect_in_cluster(cluster, nodes, nodes, self.graph)
+
+    # sources -> targets tavolsagok a klaszteren belul, az eleket a graph szotarba irja
+    def _connect_in_cluster(self, cluster, sources, targets, graph):
+        sub, row0, col0 = self._cluster_grid(cluster)
+        cols = self.grid.cols
+        local = {pos: (pos // cols - row0, pos % cols - col0) for pos in set(sources) | set(targets)}
+        for source in sources:
+            others = [t for t in targets if t != source]
+            distances = source_distances(sub, local[source], [local[t] for t in others])
+            for target, distance in zip(others, distances):
+                if distance is not None:
+                    graph.setdefault(source, []).append((target, distance))
+
+    # ut a klaszteren belul a meglevo A*-gal, globalis koordinatakra visszaalakitva
+    def _refine(self, a, b):
+        cols = self.grid.cols
+        a_pos, b_pos = divmod(a, cols), divmod(b, cols)
+        cluster = self._cluster_of(*a_pos)
+        if cluster != self._cluster_of(*b_pos):
+            return [a_pos, b_pos]  # klaszterek kozotti atjaro, egyetlen lepes
+        sub, row0, col0 = self._cluster_grid(cluster)
+        path = a_star_compact(sub, (a_pos[0] - row0, a_pos[1] - col0), (b_pos[0] - row0, b_pos[1] - col0))
+        return [(row + row0, col + col0) for row, col in path]
+
+    # lekerdezes: start es cel beillesztese az absztrakt grafba, A* az absztrakt grafon,
+    # majd finomitas; stats["expanded"] az absztrakt A* kiterjesztett csucsainak szama
+    def find_path(self, start, goal, stats=None):
+        cols = self.grid.cols
+        if start == goal:
+            return [start]
+        if not self._is_free(*goal):
+            return None
+        start_pos = start[0] * cols + start[1]
+        goal_pos = goal[0] * cols + goal[1]
+        start_cluster = self._cluster_of(*start)
+        goal_cluster = self._cluster_of(*goal)
+
+        # ideiglenes elek: start -> sajat klaszter bejaratai, cel klaszter bejaratai -> cel
+        extra = {}
+        start_targets = list(self.cluster_nodes.get(start_cluster, []))
+        if start_cluster == goal_cluster:
+            start_targets.append(goal_pos)
+        self._connect_in_cluster(start_cluster, [start_pos], start_targets, extra)
+        goal_entrances = self.cluster_nodes.get(goal_cluster, [])
+        goal_edges = {}
+        self._connect_in_cluster(goal_cluster, [goal_pos], goal_entrances, goal_edges)
+        for entrance, cost in goal_edges.get(goal_pos, []):
+            extra.setdefault(entrance, []).append((goal_pos, cost))
+
+        graph = self.graph
+        g_score = {start_pos: 0}
+        came_from = {}
+        closed = set()
+        open_heap = [(manhattan_distance(start, goal), 0, start_pos)]
+        counter = 1
+        expanded = 0
+        found = False
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current == goal_pos:
+                found = True
+                break
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+            for neighbor, cost in graph.get(current, []) + extra.get(current, []):
+                tentative_g = g_score[current] + cost
+                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    f = tentative_g + manhattan_distance(divmod(neighbor, cols), goal)
+                    heapq.heappush(open_heap, (f, counter, neighbor))
+                    counter += 1
+
+        if stats is not None:
+            stats["expanded"] = expanded
+        if not found:
+            return None
+        abstract_path = reconstruct_path(came_from, start_pos, goal_pos)
+        path = [start]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            path.extend(self._refine(a, b)[1:])
+        return path
+
+# HPA* osszehasonlitasa a lapos kereses: lekerdezesi ido es az uthossz-tobblet
+def benchmark_hpa(size=512, queries=200, cluster_size=16, seed=42):
+    import random
+    import time
+
+    rng = random.Random(seed)
+    bench_grid = parse_grid(generate_open_map(size, rng, wall_ratio=0.2), compact=True)
+    free_cells = [(row, col) for row in range(size) for col in range(size) if is_not_wall(bench_grid, row, col)]
+
+    t0 = time.perf_counter()
+    HierarchicalPlanner(bench_grid, cluster_size).build()
+    t1 = time.perf_counter()
+    planner = HierarchicalPlanner.load_or_build(bench_grid, cluster_size)
+    t2 = time.perf_counter()
+    planner = HierarchicalPlanner.load_or_build(bench_grid, cluster_size)
+    t3 = time.perf_counter()
+    print(f"terkep: {size} x {size}, klaszter: {cluster_size}, absztrakt csucsok: {len(planner.graph)}")
+    print(f"elofeldolgozas: {t1 - t0:.2f} s, gyorsitotarbol betoltes: {t3 - t2:.3f} s")
+
+    flat_time = hpa_time = 0.0
+    ratios = []
+    for _ in range(queries):
+        start, goal = rng.sample(free_cells, 2)
+        t0 = time.perf_counter()
+        flat = a_star_compact(bench_grid, start, goal)
+        t1 = time.perf_counter()
+        hierarchical = planner.find_path(start, goal)
+        t2 = time.perf_counter()
+        flat_time += t1 - t0
+        hpa_time += t2 - t1
+        if flat and hierarchical:
+            ratios.append((len(hierarchical) - 1) / max(1, len(flat) - 1))
+    ratios.sort()
+    print(f"atlagos lekerdezesi ido: lapos A* {flat_time / queries * 1000:.1f} ms, HPA* {hpa_time / queries * 1000:.1f} ms")
+    print(f"uthossz arany (HPA* / optimalis): atlag {sum(ratios) / len(ratios):.4f}, "
+          f"median {ratios[len(ratios) // 2]:.4f}, max {ratios[-1]:.4f}")
+
+# labirintus generalasa iterativ melysegi keresessel (paratlan meretu racson)
+def generate_maze(size, rng):
+    size |= 1
+    cells = [["#"] * size for _ in range(size)]
+    stack = [(1, 1)]
+    cells[1][1] = "."
+    while stack:
+        row, col = stack[-1]
+        options = [(row + 2 * dr, col + 2 * dc, dr, dc) for dr, dc in DIRECTIONS
+                   if 0 < row + 2 * dr < size - 1 and 0 < col + 2 * dc < size - 1
+                   and cells[row + 2 * dr][col + 2 * dc] == "#"]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, dr, dc = rng.choice(options)
+        cells[row + dr][col + dc] = "."
+        cells[next_row][next_col] = "."
+        stack.append((next_row, next_col))
+    return "\n".join("".join(row) for row in cells)
+
+# nyilt terkep: keves szorvanyos akadaly
+def generate_open_map(size, rng, wall_ratio=0.05):
+    return "\n".join("".join("#" if rng.random() < wall_ratio else "." for _ in range(size)) for _ in range(size))
+
+# a tervezok osszehasonlitasa: kiterjesztett csucsok, ugrasok soran erintett cellak, ido
+def benchmark_planners(size=301, seed=42):
+    import random
+    import time
+
+    rng = random.Random(seed)
+    maps = {"labirintus": generate_maze(size, rng), "nyilt": generate_open_map(size, rng)}
+    for name, text in maps.items():
+        bench_grid = parse_grid(text, compact=True)
+        start, goal = (1, 1), (bench_grid.rows - 2, bench_grid.cols - 2)
+        for cell in (start, goal):
+            bench_grid.cells[bench_grid.index(*cell)] = ord(".")
+        print(f"{name} terkep ({bench_grid.rows} x {bench_grid.cols}):")
+        for planner in PLANNERS:
+            stats = {}
+            t0 = time.perf_counter()
+            path = find_path(bench_grid, start, goal, planner, stats)
+            elapsed = time.perf_counter() - t0
+            length = len(path) - 1 if path else None
+            print(f" - {planner:10s}: uthossz = {length}, kiterjesztett = {stats['expanded']:7d}, "
+                  f"erintett (ugras) = {stats.get('scanned', 0):7d}, ido = {elapsed * 1000:8.1f} ms")
+
+def main():
+    grid = r"""
 ##########
 #S...#...#
 #.##.#.#.#
@@ -134,18 +1220,35 @@ grid = r"""
 ##########
 """
 
-parsed_grid = parse_grid(grid)
+    parsed_grid = parse_grid(grid)
+
+    start = find_char(parsed_grid, "S")
+    goal = find_char(parsed_grid, "G")
 
-start = find_char(parsed_grid, "S")
-goal = find_char(parsed_grid, "G")
+    path = a_star_algorithm(parsed_grid, start, goal)
 
-path = a_star_algorithm(parsed_grid, start, goal)
+    if path:
+        print("Utvonal megtalalva.")
+        print(render_path(parsed_grid, path))
+    else:
+        print("Nincs elerheto ut a celhoz.")
 
-if path:
-    print("Utvonal megtalalva.")
-    print(render_path(parsed_grid, path))
-else:
-    print("Nincs elerheto ut a celhoz.")
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench-mmap", metavar="PATH", help="nagy terkep generalasa (ha nincs) es mmap betoltes merese")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--bench-planners", action="store_true", help="A* / maszkos A* / JPS osszehasonlitasa")
+    parser.add_argument("--bench-hpa", action="store_true", help="HPA* es lapos A* osszehasonlitasa")
+    args = parser.parse_args()
+    if args.bench_mmap:
+        benchmark_mmap_loader(args.bench_mmap, args.size_mb)
+    elif args.bench_planners:
+        benchmark_planners()
+    elif args.bench_hpa:
+        benchmark_hpa()
+    else:
+        main()
 
 # kerdesek:
 # mit jelentenek a g, h, f ertekek: 
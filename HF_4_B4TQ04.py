@@ -1,8 +1,12 @@
-import matplotlib.pyplot as plt
-import networkx as nx
-from pgmpy.models import DiscreteBayesianNetwork
-from pgmpy.factors.discrete import TabularCPD
-from pgmpy.inference import VariableElimination
+import time
+_IMPORT_START = time.perf_counter()
+
+import numpy as np
+from collections import OrderedDict
+from itertools import product
+
+# a matplotlib, networkx es pgmpy importok lustak: csak abban a fuggvenyben toltodnek be,
+# amelyik tenylegesen hasznalja oket (headless, gyors motoros futasnal egyik sem kell)
 
 # parameterek a Bayes-halohoz
 PRIOR_INF = 0.10 # prior valoszinuseg
@@ -17,9 +21,35 @@ P_TEST_IF_NOT = 0.05 # ha nincs influenza, akkor 5%, hogy a teszt pozitiv - fals
 def fmt(p):
     return f"{p:.4f}"
 
+# prior valoszinusegi tabla (kulon, hogy what-if eseten csak ezt kelljen kicserelni)
+def build_cpd_influenza(prior_inf=PRIOR_INF):
+    from pgmpy.factors.discrete import TabularCPD
+    return TabularCPD(
+        variable="Influenza",
+        variable_card=2, # 0->nincs influenza, 1->van influenza
+        values=[[1.0 - prior_inf], [prior_inf]]
+    )
+
+# teszt valoszinusegi tablaja (kulon, hogy what-if eseten csak ezt kelljen kicserelni)
+def build_cpd_testpos(p_test_if_not=P_TEST_IF_NOT):
+    from pgmpy.factors.discrete import TabularCPD
+    return TabularCPD(
+        variable="TestPos",
+        variable_card=2,
+        values=[
+            [1.0 - p_test_if_not, 1.0 - P_TEST_IF_INF],  # testpos=0
+            [p_test_if_not, P_TEST_IF_INF]               # testpos=1
+        ],
+        evidence=["Influenza"],
+        evidence_card=[2]
+    )
+
 # Bayes-halot felepito algoritmus
 # bemenet: influenza elofordulasi valoszinusege, teszt false positive aranya
 def build_model(prior_inf=PRIOR_INF, p_test_if_not=P_TEST_IF_NOT):
+    from pgmpy.models import DiscreteBayesianNetwork
+    from pgmpy.factors.discrete import TabularCPD
+
     # halo struktura
     # sima "BayesianNetwork" deprecatedkent lett jelolve, a csomag a "DiscreteBayesianNetwork"-t jelolte meg, hogy ezt kell hasznalni helyette
     # ok: influenza, megfigyelesek: fever, cough, testpos
@@ -30,11 +60,7 @@ def build_model(prior_inf=PRIOR_INF, p_test_if_not=P_TEST_IF_NOT):
     ])
 
     # prior valoszinusegi tablaja
-    cpd_influenza = TabularCPD(
-        variable="Influenza",
-        variable_card=2, # 0->nincs influenza, 1->van influenza
-        values=[[1.0 - prior_inf], [prior_inf]]
-    )
+    cpd_influenza = build_cpd_influenza(prior_inf)
 
     # laz valoszinusegi tablaja
     cpd_fever = TabularCPD(
@@ -61,22 +87,16 @@ def build_model(prior_inf=PRIOR_INF, p_test_if_not=P_TEST_IF_NOT):
     )
 
     # teszt valoszinusegi tablaja
-    cpd_testpos = TabularCPD(
-        variable="TestPos",
-        variable_card=2,
-        values=[
-            [1.0 - p_test_if_not, 1.0 - P_TEST_IF_INF],  # testpos=0
-            [p_test_if_not, P_TEST_IF_INF]               # testpos=1
-        ],
-        evidence=["Influenza"],
-        evidence_card=[2]
-    )
+    cpd_testpos = build_cpd_testpos(p_test_if_not)
 
     model.add_cpds(cpd_influenza, cpd_fever, cpd_cough, cpd_testpos)
     return model
 
 # Bayes-halo vizualis reprezentacioja
 def draw_graph(model):
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     # 1. iranyitott graf letrehozasa
     G = nx.DiGraph()
 
@@ -94,71 +114,524 @@ def draw_graph(model):
 
 # posterior valoszinuseg kiszamitasa
 # egyetlen szamertekkel ter vissza
-def query_posterior(model, evidence):
-    # variable elimination algoritmus segitsegevel inference objektum letrehozasa
-    infer = VariableElimination(model)
-    q = infer.query(variables=["Influenza"], evidence=evidence, show_progress=False)
-    # q.values sorrendje: index 0 -> influenza=0, index 1 -> influenza=1
-    p_inf_1 = float(q.values[1])
-    return p_inf_1
+# method="exact": modellenkent egyetlen "leforditott" inference objektum (lasd CompiledInference)
+# method="lw" / "gibbs": mintavetelezeses kozelites (lasd approximate_posterior), a tovabbi
+# kulcsszavas parameterek oda tovabbitodnak
+def query_posterior(model, evidence, method="exact", **options):
+    if method == "exact":
+        return compiled_inference(model).query(evidence)
+    return approximate_posterior(model, evidence, method, **options)["p"]
+
+# megfigyelheto valtozok: mindegyik 0, 1 vagy nem megfigyelt (None) -> 3^3 = 27 kombinacio
+EVIDENCE_VARS = ("Fever", "Cough", "TestPos")
+
+# a modell CPD-inek ujjlenyomata: ha barmelyik CPD (vagy annak erteke) valtozik, ez is valtozik
+def cpd_fingerprint(model):
+    return tuple((cpd.variable, tuple(cpd.variables), cpd.values.tobytes()) for cpd in model.cpds)
+
+# "leforditott" inference egy modellhez
+# a VariableElimination objektum (faktorok, struktura) egyszer epul fel, a posteriorokat
+# evidencia-kombinaciok szerint egy LRU tablaban taroljuk
+# minden lekerdezes elott ellenorizzuk a CPD ujjlenyomatot: ha valtozott, az inference
+# objektumot ujraepitjuk es a tablat uritjuk
+class CompiledInference:
+    def __init__(self, model, target="Influenza", maxsize=32):
+        self.model = model
+        self.target = target
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fingerprint = None
+        self._infer = None
+        self._cache = OrderedDict()
+
+    def _refresh(self):
+        from pgmpy.inference import VariableElimination
+
+        fingerprint = cpd_fingerprint(self.model)
+        if fingerprint != self._fingerprint:
+            self._infer = VariableElimination(self.model)
+            self._cache.clear()
+            self._fingerprint = fingerprint
+
+    # P(target | evidence) teljes eloszlaskent (csak olvashato tomb, index = target allapota);
+    # a None erteku (nem megfigyelt) valtozokat kihagyjuk
+    def distribution(self, evidence):
+        self._refresh()
+        key = tuple(sorted((var, state) for var, state in evidence.items() if state is not None))
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            return cache[key]
+        self.misses += 1
+        q = self._infer.query(variables=[self.target], evidence=dict(key), show_progress=False)
+        values = np.array(q.values, dtype=float)
+        values.flags.writeable = False
+        cache[key] = values
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return values
+
+    # P(target=1 | evidence)
+    # distribution() sorrendje: index 0 -> influenza=0, index 1 -> influenza=1
+    def query(self, evidence):
+        return float(self.distribution(evidence)[1])
+
+    # az osszes evidencia-kombinacio elore kiszamitasa (a tabla "bemelegitese")
+    def warm(self, variables=EVIDENCE_VARS):
+        for states in product((None, 0, 1), repeat=len(variables)):
+            self.query(dict(zip(variables, states)))
+
+    # egy CPD kicserelese a modellben (pl. what-if); a gyorsitotar a kovetkezo lekerdezeskor urul
+    # a csere utan a teljes modellt ellenorizzuk (szulok, kardinalitasok); hiba eseten a regi CPD visszakerul
+    def set_cpd(self, cpd):
+        if not cpd.is_valid_cpd():
+            raise ValueError(f"ervenytelen CPD: {cpd.variable}")
+        old = self.model.get_cpds(cpd.variable)
+        if old is not None:
+            self.model.remove_cpds(old)
+        self.model.add_cpds(cpd)
+        try:
+            self.model.check_model()
+        except ValueError:
+            self.model.remove_cpds(cpd)
+            if old is not None:
+                self.model.add_cpds(old)
+            raise
+
+# modellenkent egy CompiledInference peldany, magan a modellen tarolva
+# (a pgmpy halok az egyenloseget strukturara ertelmezik, ezert szotarkulcskent nem hasznalhatok)
+def compiled_inference(model):
+    compiled = getattr(model, "_compiled_inference", None)
+    if compiled is None:
+        compiled = CompiledInference(model)
+        model._compiled_inference = compiled
+    return compiled
+
+# kozelito inference mintavetelezessel (nagyobb halokhoz, ahol az egzakt eliminacio mar draga)
+# a halot egyszer "leforditjuk" egyszeru, picklezheto tablakra:
+# order - topologikus sorrend, cards - kardinalitasok, parents - szulok indexei,
+# tables - (allapot, *szulo allapotok) alaku valoszinusegi tombok
+def sampling_tables(model):
+    nodes = list(model.nodes())
+    remaining = {node: set(model.get_parents(node)) for node in nodes}
+    order = []
+    while remaining:
+        ready = [node for node in nodes if node in remaining and not remaining[node]]
+        if not ready:
+            raise ValueError("a halo nem iranyitott kormentes graf")
+        for node in ready:
+            order.append(node)
+            del remaining[node]
+            for deps in remaining.values():
+                deps.discard(node)
+    index = {node: i for i, node in enumerate(order)}
+    cards, parents, tables = [], [], []
+    for node in order:
+        cpd = model.get_cpds(node)
+        cards.append(int(cpd.variable_card))
+        parents.append(tuple(index[var] for var in cpd.variables[1:]))
+        tables.append(np.asarray(cpd.values, dtype=float))
+    return order, cards, parents, tables
+
+# kategorikus mintavetel oszloponkent: probs (kardinalitas, n) alaku
+def _sample_states(probs, rng):
+    u = rng.random(probs.shape[1])
+    return np.minimum((u > np.cumsum(probs, axis=0)).sum(axis=0), probs.shape[0] - 1)
+
+# likelihood weighting egy kotege; elegseges statisztikakat ad vissza a kombinalashoz:
+# (sum w, sum w*x, sum w^2, sum w^2*x), ahol x = [target == 1]
+def _lw_batch(compiled, evidence, target, n, seed):
+    order, cards, parents, tables = compiled
+    rng = np.random.default_rng(seed)
+    states = [None] * len(order)
+    weights = np.ones(n)
+    for i in range(len(order)):
+        parent_states = tuple(states[p] for p in parents[i])
+        if i in evidence:
+            states[i] = np.full(n, evidence[i])
+            weights *= tables[i][(evidence[i],) + parent_states]
+        else:
+            probs = tables[i][(slice(None),) + parent_states]
+            states[i] = _sample_states(np.broadcast_to(probs.reshape(cards[i], -1), (cards[i], n)), rng)
+    x = states[target] == 1
+    w2 = weights * weights
+    return weights.sum(), weights[x].sum(), w2.sum(), w2[x].sum()
+
+# Gibbs mintavetel: sok lanc parhuzamosan (a lancok a tomb oszlopai)
+# egy kor n_sweeps teljes atfutas; visszaadja az uj allapotot es lanconkent a [target == 1] osszeget
+def _gibbs_round(compiled, evidence, target, state, n_sweeps, seed):
+    order, cards, parents, tables = compiled
+    rng = np.random.default_rng(seed)
+    n_chains = state.shape[1]
+    children = [[j for j in range(len(order)) if i in parents[j]] for i in range(len(order))]
+    free_vars = [i for i in range(len(order)) if i not in evidence]
+    hits = np.zeros(n_chains)
+    for _ in range(n_sweeps):
+        for i in free_vars:
+            # P(X_i | Markov-takaro) ~ P(X_i | szulok) * prod_gyerekek P(gyerek | szulei)
+            scores = np.empty((cards[i], n_chains))
+            for k in range(cards[i]):
+                state[i] = k
+                score = tables[i][(k,) + tuple(state[p] for p in parents[i])].copy()
+                for j in children[i]:
+                    score *= tables[j][(state[j],) + tuple(state[p] for p in parents[j])]
+                scores[k] = score
+            state[i] = _sample_states(scores / scores.sum(axis=0), rng)
+        hits += state[target] == 1
+    return state, hits
+
+# vegtelen seed-folyam egy SeedSequence-bol: a tombot igeny szerint duplazva generaljuk ujra
+# (generate_state(n) prefixe generate_state(m)-nek, ha n < m, igy a sorozat rogzitett)
+def _seed_stream(seed):
+    seq = np.random.SeedSequence(seed)
+    size, done = 64, 0
+    while True:
+        yield from seq.generate_state(size)[done:]
+        done, size = size, size * 2
+
+# kozelito posterior: method="lw" (likelihood weighting) vagy "gibbs"
+# tol: a standard hiba celerteke - ha eleri, a mintavetelezes leall; max_samples: felso korlat
+# workers > 1 eseten a kotegek / lanccsoportok process poolon futnak, fuggetlen seed-ekkel
+# gibbs eseten a standard hiba a lancatlagok szorasabol jon, ezert legalabb 2 lanc kell
+# visszateres: szotar (p, standard hiba, mintak szama)
+def approximate_posterior(model, evidence, method="lw", target="Influenza", tol=1e-3,
+                          batch_size=20000, max_samples=2_000_000, workers=1, seed=0,
+                          n_chains=1000, burn_in=50):
+    from concurrent.futures import ProcessPoolExecutor
+
+    if method == "gibbs" and n_chains < 2:
+        raise ValueError(f"gibbs mintavetelhez legalabb 2 lanc kell (n_chains = {n_chains})")
+    compiled = sampling_tables(model)
+    index = {node: i for i, node in enumerate(compiled[0])}
+    evidence_idx = {index[var]: int(state) for var, state in evidence.items() if state is not None}
+    target_idx = index[target]
+    seeds = _seed_stream(seed)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def run(fn, args_list):
+        if pool is None:
+            return [fn(*args) for args in args_list]
+        return list(pool.map(fn, *zip(*args_list)))
+
+    try:
+        if method == "lw":
+            totals = np.zeros(4)
+            n = 0
+            p = se = float("nan")
+            while n < max_samples:
+                jobs = [(compiled, evidence_idx, target_idx, batch_size, next(seeds)) for _ in range(max(1, workers))]
+                for stats in run(_lw_batch, jobs):
+                    totals += stats
+                n += batch_size * len(jobs)
+                sum_w, sum_wx, sum_w2, sum_w2x = totals
+                p = sum_wx / sum_w
+                # aranybecslo standard hibaja: sqrt(sum w^2 (x - p)^2) / sum w
+                se = float(np.sqrt(max(sum_w2x - 2 * p * sum_w2x + p * p * sum_w2, 0.0)) / sum_w)
+                if se <= tol:
+                    break
+            return {"p": float(p), "se": se, "samples": n}
+
+        if method == "gibbs":
+            # kezdoallapot: elore mintavetelezes rogzitett evidenciaval
+            groups = max(1, min(workers, n_chains))
+            order, cards, parents, tables = compiled
+            rng = np.random.default_rng(next(seeds))
+            states = []
+            for g in range(groups):
+                size = n_chains // groups + (g < n_chains % groups)
+                state = np.zeros((len(order), size), dtype=np.int64)
+                for i in range(len(order)):
+                    if i in evidence_idx:
+                        state[i] = evidence_idx[i]
+                    else:
+                        probs = tables[i][(slice(None),) + tuple(state[p] for p in parents[i])]
+                        state[i] = _sample_states(np.broadcast_to(probs.reshape(cards[i], -1), (cards[i], size)), rng)
+                states.append(state)
+            # beegesi szakasz, a mintakat eldobjuk
+            states = [s for s, _ in run(_gibbs_round, [(compiled, evidence_idx, target_idx, s, burn_in, next(seeds))
+                                                       for s in states])]
+            hits = np.zeros(n_chains)
+            sweeps = 0
+            n = 0
+            p = se = float("nan")
+            sweeps_per_round = max(1, batch_size // n_chains)
+            while n < max_samples:
+                results = run(_gibbs_round, [(compiled, evidence_idx, target_idx, s, sweeps_per_round, next(seeds))
+                                             for s in states])
+                states = [s for s, _ in results]
+                hits += np.concatenate([h for _, h in results])
+                sweeps += sweeps_per_round
+                n += sweeps_per_round * n_chains
+                chain_means = hits / sweeps
+                p = chain_means.mean()
+                # a lancatlagok fuggetlenek, igy a szorasukbol becsulheto a standard hiba
+                se = float(chain_means.std(ddof=1) / np.sqrt(n_chains))
+                if se <= tol:
+                    break
+            return {"p": float(p), "se": se, "samples": n}
+
+        raise ValueError(f"ismeretlen modszer: {method}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+# mintavetelezo backendek ellenorzese az egzakt posteriorhoz kepest (soros es process poolos ut)
+# a gibbs workers=3 / kis koteg / szigoru tol beallitas a seed-folyam kimerulesenek regi hibajat fedi le;
+# elteres: legfeljebb 5 standard hiba
+def check_sampling(evidence=None):
+    if evidence is None:
+        evidence = {"Fever": 1, "Cough": 1, "TestPos": 1}
+    model = build_model()
+    exact = compiled_inference(model).query(evidence)
+    ok = True
+    for method, options in (("lw", {"workers": 1}), ("lw", {"workers": 2}),
+                            ("gibbs", {"workers": 1}),
+                            ("gibbs", {"workers": 3, "batch_size": 1500, "max_samples": 200_000, "tol": 1e-4})):
+        result = approximate_posterior(model, evidence, method, **options)
+        passed = abs(result["p"] - exact) <= 5 * result["se"]
+        ok = ok and passed
+        print(f"{method:5s} {options}: p = {result['p']:.5f} (egzakt {exact:.5f}), se = {result['se']:.5f}, "
+              f"{result['samples']} minta -> {'ok' if passed else 'HIBA'}")
+    return ok
+
+# zart formulas posterior "csillag" alaku halokra (egy szulo, felteteles fuggetlen gyerekek)
+# P(ok | e) ~ P(ok) * prod_j P(e_j | ok), ezert pgmpy nelkul, tetszoleges sok
+# evidencia-soron egyetlen vektorizalt lepesben kiszamithato
+# evidencia sorok: egesz tomb, (n, len(evidence_vars)), ertekei allapotindexek, -1: nem megfigyelt
+class StarPosteriorEngine:
+    def __init__(self, model, target="Influenza", evidence_vars=EVIDENCE_VARS):
+        if model.get_parents(target):
+            raise ValueError(f"{target} nem gyoker csucs")
+        for node in model.nodes():
+            if node != target and list(model.get_parents(node)) != [target]:
+                raise ValueError(f"nem csillag struktura: {node} szulei {list(model.get_parents(node))}")
+        for var in evidence_vars:
+            if var == target or var not in model.nodes():
+                raise ValueError(f"ismeretlen evidencia valtozo: {var}")
+        self.target = target
+        self.evidence_vars = tuple(evidence_vars)
+        self.prior = np.asarray(model.get_cpds(target).values, dtype=float)
+        # gyerekenkent (allapot, ok-allapot) alaku likelihood tabla
+        self.likelihoods = [np.asarray(model.get_cpds(var).values, dtype=float) for var in self.evidence_vars]
+
+    # posterior eloszlas minden sorra: (n, ok kardinalitasa)
+    def posterior(self, rows):
+        rows = np.asarray(rows)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        joint = np.broadcast_to(self.prior, (rows.shape[0], self.prior.shape[0])).copy()
+        for j, table in enumerate(self.likelihoods):
+            states = rows[:, j]
+            observed = states >= 0
+            # nem megfigyelt valtozonal a likelihood 1 (kiosszegezodik)
+            joint *= np.where(observed[:, None], table[np.where(observed, states, 0)], 1.0)
+        return joint / joint.sum(axis=1, keepdims=True)
+
+    def query(self, evidence):
+        row = [-1 if evidence.get(var) is None else evidence[var] for var in self.evidence_vars]
+        return float(self.posterior(row)[0, 1])
+
+# tartalek motor tetszoleges strukturara: a kulonbozo evidencia-sorokat egyszer, CompiledInference-szel
+# szamolja ki, majd visszaosztja az osszes sorra
+class PgmpyPosteriorEngine:
+    def __init__(self, model, target="Influenza", evidence_vars=EVIDENCE_VARS):
+        self.target = target
+        self.evidence_vars = tuple(evidence_vars)
+        self.compiled = CompiledInference(model, target)
+        self.card = model.get_cardinality(target)
+
+    def _distribution(self, row):
+        evidence = {var: int(state) for var, state in zip(self.evidence_vars, row) if state >= 0}
+        return self.compiled.distribution(evidence)
+
+    def posterior(self, rows):
+        rows = np.asarray(rows)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+        table = np.array([self._distribution(row) for row in unique_rows]).reshape(len(unique_rows), self.card)
+        return table[inverse.reshape(-1)]
+
+    def query(self, evidence):
+        return self.compiled.query(evidence)
+
+# posterior motor valasztasa: csillag strukturara a NumPy motor, minden masra pgmpy
+def posterior_engine(model, target="Influenza", evidence_vars=EVIDENCE_VARS):
+    try:
+        return StarPosteriorEngine(model, target, evidence_vars)
+    except ValueError:
+        return PgmpyPosteriorEngine(model, target, evidence_vars)
+
+# erzekenysegvizsgalat: a halo parameterei es az alapertekeik
+# parameter -> (gyerek valtozo, melyik ok-allapothoz tartozik); a prior kulon kezelendo
+SWEEP_BASE = {
+    "prior_inf": PRIOR_INF,
+    "p_fever_if_inf": P_FEVER_IF_INF,
+    "p_fever_if_not": P_FEVER_IF_NOT,
+    "p_cough_if_inf": P_COUGH_IF_INF,
+    "p_cough_if_not": P_COUGH_IF_NOT,
+    "p_test_if_inf": P_TEST_IF_INF,
+    "p_test_if_not": P_TEST_IF_NOT,
+}
+SWEEP_CHILDREN = {"Fever": "fever", "Cough": "cough", "TestPos": "test"}
+
+# erzekenysegi sweep eredmenye: dims - a valtoztatott parameterek nevei (tengelyek sorrendje),
+# coords - tengelyenkent a parameterertekek, posterior / delta - a racs minden pontjara,
+# base - az alapeset posteriorja
+class SweepResult:
+    def __init__(self, dims, coords, posterior, base):
+        self.dims = dims
+        self.coords = coords
+        self.posterior = posterior
+        self.base = base
+        self.delta = posterior - base
+
+    # egy pont kivalasztasa tengelyindexekkel, pl. sel(prior_inf=3)
+    def sel(self, **indices):
+        key = tuple(indices.get(dim, slice(None)) for dim in self.dims)
+        return self.posterior[key]
+
+# P(influenza=1 | evidence) zart formulaval, tetszolegesen broadcastolt parametertombokon
+def _star_posterior(params, evidence):
+    prior = params["prior_inf"]
+    like_inf = np.ones(())
+    like_not = np.ones(())
+    for var, name in SWEEP_CHILDREN.items():
+        state = evidence.get(var)
+        if state is None:
+            continue
+        p_inf = params[f"p_{name}_if_inf"]
+        p_not = params[f"p_{name}_if_not"]
+        like_inf = like_inf * (p_inf if state == 1 else 1.0 - p_inf)
+        like_not = like_not * (p_not if state == 1 else 1.0 - p_not)
+    joint_inf = prior * like_inf
+    return joint_inf / (joint_inf + (1.0 - prior) * like_not)
+
+# a racs egy szeletenek kiszamitasa (process poolban is futtathato)
+def _sweep_chunk(dims, axes, evidence):
+    params = dict(SWEEP_BASE)
+    for i, (dim, values) in enumerate(zip(dims, axes)):
+        shape = [1] * len(dims)
+        shape[i] = len(values)
+        params[dim] = np.asarray(values, dtype=float).reshape(shape)
+    return np.broadcast_to(_star_posterior(params, evidence), tuple(len(v) for v in axes))
+
+# erzekenysegi sweep: ranges - parameternev -> ertekek (pl. np.linspace), a tobbi parameter
+# az alaperteken marad; az eredmeny egy len(ranges) dimenzios, cimkezett tomb
+# workers > 1 eseten az elso tengely menten szeletelve, process poolon szamolunk
+def sensitivity_sweep(ranges, evidence=None, workers=1, chunks=None):
+    if evidence is None:
+        evidence = {"Fever": 1, "Cough": 1, "TestPos": 1}
+    unknown = set(ranges) - set(SWEEP_BASE)
+    if unknown:
+        raise ValueError(f"ismeretlen parameter(ek): {sorted(unknown)}")
+    dims = tuple(ranges)
+    coords = {dim: np.asarray(ranges[dim], dtype=float) for dim in dims}
+    axes = [coords[dim] for dim in dims]
+    base = float(_star_posterior(SWEEP_BASE, evidence))
+
+    if workers <= 1 or not dims:
+        posterior = np.array(_sweep_chunk(dims, axes, evidence))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        parts = np.array_split(axes[0], chunks or workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_sweep_chunk, [dims] * len(parts),
+                               [[part] + axes[1:] for part in parts], [evidence] * len(parts))
+            posterior = np.concatenate(list(results), axis=0)
+    return SweepResult(dims, coords, posterior, base)
 
 # a feladatot elvegzo funkcio
-def main():
+# headless: nincs abra (plt.show() nem blokkol), engine: "auto" | "fast" | "pgmpy"
+# "auto" eseten headless modban a zart formulas motor szamol, pgmpy be sem toltodik
+def main(headless=False, engine="auto"):
     # bemenet a szamitasokhoz
     evidence = {"Fever": 1, "Cough": 1, "TestPos": 1}
     print("hasznalt megfigyelesek (evidence): fever=1, cough=1, testpos=1\n")
 
-    # 1. Bayes-halo
+    p_test_if_not_worse = 0.20 # what-if #1: romlo teszt: false positive novelese
+    prior_rare = 0.03 # what-if #2: alapgyakorisag csokkentese
+    model_base = None
 
-    model_base = build_model(prior_inf=PRIOR_INF, p_test_if_not=P_TEST_IF_NOT)
+    if engine == "fast" or (engine == "auto" and headless):
+        # a halo csillag alaku, a posteriorok a parameterekbol kozvetlenul szamolhatok
+        p_base = float(_star_posterior(SWEEP_BASE, evidence))
+        p_worse = float(_star_posterior(dict(SWEEP_BASE, p_test_if_not=p_test_if_not_worse), evidence))
+        p_rare = float(_star_posterior(dict(SWEEP_BASE, prior_inf=prior_rare), evidence))
+    else:
+        # 1. Bayes-halo
+        model_base = build_model(prior_inf=PRIOR_INF, p_test_if_not=P_TEST_IF_NOT)
+
+        # 2. ellenorzes: CPD, graf konzisztencia
+        try:
+            model_base.check_model()
+        except Exception as e:
+            print("model check hiba:", e)
+            return
+
+        # 3. posterior kiszamitasa
+        # ez az alapeset, amihez a what-if eredmenyeket hasonlitjuk
+        # az inference objektum egyszer epul fel, a what-if-ek csak egy-egy CPD-t cserelnek benne
+        compiled = compiled_inference(model_base)
+        p_base = compiled.query(evidence)
+
+        # 4. what-if #1
+        try:
+            compiled.set_cpd(build_cpd_testpos(p_test_if_not_worse))
+        except ValueError as e:
+            print("model check hiba (worse test):", e)
+            return
+        p_worse = compiled.query(evidence)
+        compiled.set_cpd(build_cpd_testpos(P_TEST_IF_NOT)) # vissza az alapesetre
+
+        # 5. what-if #2
+        try:
+            compiled.set_cpd(build_cpd_influenza(prior_rare))
+        except ValueError as e:
+            print("model check hiba (rare prior):", e)
+            return
+        p_rare = compiled.query(evidence)
+        compiled.set_cpd(build_cpd_influenza(PRIOR_INF)) # vissza az alapesetre
 
-    # 2. ellenorzes: CPD, graf konzisztencia
-    try:
-        model_base.check_model()
-    except Exception as e:
-        print("model check hiba:", e)
-        return
-
-    # 3. posterior kiszamitasa
-    # ez az alapeset, amihez a what-if eredmenyeket hasonlitjuk
-    p_base = query_posterior(model_base, evidence)
     print("alapeset:")
     print(f"p(influenza=1 | evidence) = {fmt(p_base)}")
 
-    # 4. what-if #1: romlo teszt: false positive novelese
-    p_test_if_not_worse = 0.20
-    model_worse_test = build_model(prior_inf=PRIOR_INF, p_test_if_not=p_test_if_not_worse)
-    try:
-        model_worse_test.check_model()
-    except Exception as e:
-        print("model check hiba (worse test):", e)
-        return
-
-    p_worse = query_posterior(model_worse_test, evidence)
     delta_worse = p_worse - p_base # alapesethez kepest a kulonbseg
     print("\nwhat-if #1 (romlo teszt, false positive = 0.20):")
     print(f"p(influenza=1 | evidence) = {fmt(p_worse)}")
     print(f"delta (what-if1 - alapeset) = {fmt(delta_worse)}")
 
-    # 5. what-if #2: alapgyakorisag csokkentese
-    prior_rare = 0.03
-    model_rare = build_model(prior_inf=prior_rare, p_test_if_not=P_TEST_IF_NOT)
-    try:
-        model_rare.check_model()
-    except Exception as e:
-        print("model check hiba (rare prior):", e)
-        return
-
-    p_rare = query_posterior(model_rare, evidence)
     delta_rare = p_rare - p_base # alapesethez kepest a kulonbseg
     print("\nwhat-if #2 (ritkabb influenza, prior = 0.03):")
     print(f"p(influenza=1 | evidence) = {fmt(p_rare)}")
     print(f"delta (what-if2 - alapeset) = {fmt(delta_rare)}")
 
     # graf kirajzolasa
-    draw_graph(model_base)
+    if not headless:
+        if model_base is None:
+            model_base = build_model()
+        draw_graph(model_base)
 
-main()
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headless", action="store_true", help="abra nelkul, pl. batch futtatashoz")
+    parser.add_argument("--engine", choices=["auto", "fast", "pgmpy"], default="auto",
+                        help="posterior szamitas: zart formula (fast) vagy pgmpy; auto: headless modban fast")
+    parser.add_argument("--timing", action="store_true", help="import es teljes futasi ido kiirasa")
+    parser.add_argument("--check-sampling", action="store_true", help="mintavetelezo backendek ellenorzese")
+    args = parser.parse_args()
+    if args.check_sampling:
+        raise SystemExit(0 if check_sampling() else 1)
+    main_start = time.perf_counter()
+    main(headless=args.headless, engine=args.engine)
+    if args.timing:
+        end = time.perf_counter()
+        print(f"\nmodul import: {(main_start - _IMPORT_START) * 1000:.1f} ms, main: {(end - main_start) * 1000:.1f} ms, "
+              f"osszesen: {(end - _IMPORT_START) * 1000:.1f} ms")
 
 # kerdesek:
 # base rate hatas: megadja, mennyire valoszinu a betegseg - mennyire gyakori 
@@ -13,37 +13,29 @@ def build_universes():
     exam = np.arange(0, 101, 1)
     return study, sleep, exam
 
+# tagsagi fuggvenyek parameterei: halmaz -> (univerzum, alak, toresponotok)
+# nyelvi ertekek: study - low, medium, high; sleep - poor, average, good; exam - fail, pass, excellent
+MF_PARAMS = {
+    "study_low": ("study", "trapmf", [0, 0, 5, 15]),
+    "study_med": ("study", "trimf", [10, 20, 30]),
+    "study_high": ("study", "trapmf", [25, 30, 40, 40]),
+    "sleep_poor": ("sleep", "trapmf", [0, 0, 2, 4]),
+    "sleep_avg": ("sleep", "trimf", [3, 5, 7]),
+    "sleep_good": ("sleep", "trapmf", [6, 8, 10, 10]),
+    "exam_fail": ("exam", "trapmf", [0, 0, 30, 50]),
+    "exam_pass": ("exam", "trimf", [40, 60, 80]),
+    "exam_excellent": ("exam", "trapmf", [70, 85, 100, 100]),
+}
+
 # tagsagi fuggvenyek letrehozasa
 # megkapja a fuzzy rendszerunk 3 univerzumat
-# mindegyikhez megad 3 fuzzy halmazt
+# mindegyikhez megad 3 fuzzy halmazt (MF_PARAMS szerint)
 def build_membership_functions(study, sleep, exam):
-    # nyelvi ertekek: low, medium, high
-    study_low = fuzz.trapmf(study, [0, 0, 5, 15])
-    study_med = fuzz.trimf(study, [10, 20, 30])
-    study_high = fuzz.trapmf(study, [25, 30, 40, 40])
-
-    # nyelvi ertekek: poor, average, good
-    sleep_poor = fuzz.trapmf(sleep, [0, 0, 2, 4])
-    sleep_avg = fuzz.trimf(sleep, [3, 5, 7])
-    sleep_good = fuzz.trapmf(sleep, [6, 8, 10, 10])
-
-    # nyelvi ertekek: fail, pass, excellent
-    exam_fail = fuzz.trapmf(exam, [0, 0, 30, 50])
-    exam_pass = fuzz.trimf(exam, [40, 60, 80])
-    exam_excellent = fuzz.trapmf(exam, [70, 85, 100, 100])
-
-    mfs = {
-        "study_low": study_low,
-        "study_med": study_med,
-        "study_high": study_high,
-        "sleep_poor": sleep_poor,
-        "sleep_avg": sleep_avg,
-        "sleep_good": sleep_good,
-        "exam_fail": exam_fail,
-        "exam_pass": exam_pass,
-        "exam_excellent": exam_excellent,
-    }
-
+    universes = {"study": study, "sleep": sleep, "exam": exam}
+    mfs = {}
+    for name, (universe, shape, params) in MF_PARAMS.items():
+        mf = fuzz.trapmf if shape == "trapmf" else fuzz.trimf
+        mfs[name] = mf(universes[universe], params)
     return mfs
 
 # "fuzzifikacio": mennyire tartozik a bemenetet egy adott fuzzy halmazba
@@ -72,50 +64,46 @@ def fuzzify_inputs(study_val, sleep_val, study, sleep, mfs):
 
     return fuzzified
 
-# Mamdani szabalybazis a feladatleiras szerint
-def evaluate_rules(fuzzified, mfs, exam):
-    rules = []
-
-    # 1) keves tanulas + rossz alvas = fail 
-    a1 = np.fmin(fuzzified["study_low"], fuzzified["sleep_poor"])
-    out1 = np.fmin(a1, mfs["exam_fail"])
-    rules.append(("study low and sleep poor -> fail", a1, out1))
+# Mamdani szabalybazis a feladatleiras szerint, adatkent megadva
+# antecedents: bemeneti halmazok, connective: "and" (min) / "or" (max),
+# consequent: kimeneti halmaz, weight: az aktivacio szorzoja (a kimeneti halmaz levagasi magassaga)
+from collections import namedtuple
+Rule = namedtuple("Rule", ["antecedents", "connective", "consequent", "weight", "description"])
 
+RULES = [
+    # 1) keves tanulas + rossz alvas = fail
+    Rule(("study_low", "sleep_poor"), "and", "exam_fail", 1.0, "study low and sleep poor -> fail"),
     # 2) keves tanulas + atlagos alvas = fail
-    a2 = np.fmin(fuzzified["study_low"], fuzzified["sleep_avg"])
-    out2 = np.fmin(a2, mfs["exam_fail"])
-    rules.append(("study low and sleep avg -> fail", a2, out2))
-
+    Rule(("study_low", "sleep_avg"), "and", "exam_fail", 1.0, "study low and sleep avg -> fail"),
     # 3) kozepes tanulas es atlagos alvas => pass
-    a3 = np.fmin(fuzzified["study_med"], fuzzified["sleep_avg"])
-    out3 = np.fmin(a3, mfs["exam_pass"])
-    rules.append(("study med and sleep avg -> pass", a3, out3))
-
+    Rule(("study_med", "sleep_avg"), "and", "exam_pass", 1.0, "study med and sleep avg -> pass"),
     # 4) sok tanulas es jo alvas => excellent
-    a4 = np.fmin(fuzzified["study_high"], fuzzified["sleep_good"])
-    out4 = np.fmin(a4, mfs["exam_excellent"])
-    rules.append(("study high and sleep good -> excellent", a4, out4))
-
-    # 5) sok tanulas vagy jo alvas => pass/excellent 
-    a5 = np.fmax(fuzzified["study_high"], fuzzified["sleep_good"])
-    out5_pass = np.fmin(a5, mfs["exam_pass"])
-    out5_ex = np.fmin(a5 * 0.7, mfs["exam_excellent"])
-    rules.append(("study high or sleep good -> pass (and some excellent)", a5, np.fmax(out5_pass, out5_ex)))
-
-    # 6) kozepes tanulas es jo alvas => pass 
-    a6 = np.fmin(fuzzified["study_med"], fuzzified["sleep_good"])
-    out6 = np.fmin(a6, mfs["exam_pass"])
-    rules.append(("study med and sleep good -> pass", a6, out6))
-
-    # 7) kev�s tanulas es jo alvas => pass 
-    a7 = np.fmin(fuzzified["study_low"], fuzzified["sleep_good"])
-    out7 = np.fmin(a7 * 0.5, mfs["exam_pass"])
-    rules.append(("study low and sleep good -> weak pass", a7, out7))
-
-    # 8) sok tanulas es rossz alvas => pass 
-    a8 = np.fmin(fuzzified["study_high"], fuzzified["sleep_poor"])
-    out8 = np.fmin(a8 * 0.6, mfs["exam_pass"])
-    rules.append(("study high and sleep poor -> pass (reduced)", a8, out8))
+    Rule(("study_high", "sleep_good"), "and", "exam_excellent", 1.0, "study high and sleep good -> excellent"),
+    # 5) sok tanulas vagy jo alvas => pass/excellent
+    Rule(("study_high", "sleep_good"), "or", "exam_pass", 1.0, "study high or sleep good -> pass"),
+    Rule(("study_high", "sleep_good"), "or", "exam_excellent", 0.7, "study high or sleep good -> (some) excellent"),
+    # 6) kozepes tanulas es jo alvas => pass
+    Rule(("study_med", "sleep_good"), "and", "exam_pass", 1.0, "study med and sleep good -> pass"),
+    # 7) keves tanulas es jo alvas => pass
+    Rule(("study_low", "sleep_good"), "and", "exam_pass", 0.5, "study low and sleep good -> weak pass"),
+    # 8) sok tanulas es rossz alvas => pass
+    Rule(("study_high", "sleep_poor"), "and", "exam_pass", 0.6, "study high and sleep poor -> pass (reduced)"),
+]
+
+# egy szabaly aktivacioja (skalar vagy tomb tagsagi ertekekre is mukodik)
+def rule_activation(rule, fuzzified):
+    combine = np.fmin if rule.connective == "and" else np.fmax
+    activation = fuzzified[rule.antecedents[0]]
+    for name in rule.antecedents[1:]:
+        activation = combine(activation, fuzzified[name])
+    return activation
+
+def evaluate_rules(fuzzified, mfs, exam):
+    rules = []
+    for rule in RULES:
+        activation = rule_activation(rule, fuzzified)
+        clip = activation * rule.weight if rule.weight != 1.0 else activation
+        rules.append((rule.description, activation, np.fmin(clip, mfs[rule.consequent])))
 
     # aggregacio: szabalyok egyesitese egyetlen fuzzy halmazza
     # defuzzifikacio resze
@@ -140,6 +128,668 @@ def defuzzify_and_interpret(aggregated, exam):
         interp = "excellent"
     return result, interp
 
+# kotegelt (batch) kiertekeles: sok (study, sleep) par egyetlen NumPy lepesben
+# a tagsagi ertekek (batch,) alakuak, a szabalyok kimenetei es az aggregalt halmaz
+# (batch x univerzum) alaku tombok
+
+# fuzzifikacio tombokre: np.interp kozvetlenul vektorizalt
+def fuzzify_inputs_batch(study_vals, sleep_vals, study, sleep, mfs):
+    study_vals = np.asarray(study_vals, dtype=float)
+    sleep_vals = np.asarray(sleep_vals, dtype=float)
+    fuzzified = {}
+    for name in ("study_low", "study_med", "study_high"):
+        fuzzified[name] = fuzz.interp_membership(study, mfs[name], study_vals)
+    for name in ("sleep_poor", "sleep_avg", "sleep_good"):
+        fuzzified[name] = fuzz.interp_membership(sleep, mfs[name], sleep_vals)
+    return fuzzified
+
+# ugyanaz a szabalybazis (RULES), mint evaluate_rules-ban, (batch x univerzum) tombokon
+# visszaadja a szabalyaktivaciokat (szabaly x batch) es az aggregalt halmazt
+def evaluate_rules_batch(fuzzified, mfs, exam):
+    activations = np.stack([rule_activation(rule, fuzzified) for rule in RULES])
+    aggregated = np.zeros((activations.shape[1], len(exam)))
+    for rule, act in zip(RULES, activations):
+        # levagas fmin-nel, aggregacio fmax-szal
+        clip = act * rule.weight if rule.weight != 1.0 else act
+        np.fmax(aggregated, np.fmin(clip[:, None], mfs[rule.consequent][None, :]), out=aggregated)
+    return activations, aggregated
+
+# sulypont (centroid) soronkent, ugyanazzal a szakaszonkent linearis keplettel, mint fuzz.defuzz:
+# szakaszonkent terulet = dx * (y1 + y2) / 2, nyomatek = terulet * x1 + dx^2 * (y1 + 2 * y2) / 6
+# ures kimeneti halmaz eseten (ahol a soros ut EmptyMembershipError-t dobna) NaN az eredmeny
+def defuzzify_and_interpret_batch(aggregated, exam):
+    x = np.asarray(exam, dtype=float)
+    x1 = x[:-1]
+    dx = np.diff(x)
+    y1 = aggregated[:, :-1]
+    y2 = aggregated[:, 1:]
+    area = 0.5 * dx * (y1 + y2)
+    moment = area * x1 + dx * dx * (y1 + 2.0 * y2) / 6.0
+    sum_area = area.sum(axis=1)
+    result = moment.sum(axis=1) / np.fmax(sum_area, np.finfo(float).eps)
+    result[aggregated.sum(axis=1) == 0] = np.nan
+    interp = np.where(result < 50, "fail", np.where(result < 75, "pass", "excellent"))
+    interp[np.isnan(result)] = ""
+    return result, interp
+
+# teljes kotegelt pontozas; a (batch x univerzum) atmeneti tombok miatt chunk_size soronkent halad
+def score_batch(study_vals, sleep_vals, study, sleep, exam, mfs, chunk_size=16384):
+    study_vals = np.atleast_1d(np.asarray(study_vals, dtype=float))
+    sleep_vals = np.atleast_1d(np.asarray(sleep_vals, dtype=float))
+    results = np.empty(len(study_vals))
+    interps = np.empty(len(study_vals), dtype="<U9")
+    for start in range(0, len(study_vals), chunk_size):
+        end = start + chunk_size
+        fuzzified = fuzzify_inputs_batch(study_vals[start:end], sleep_vals[start:end], study, sleep, mfs)
+        _, aggregated = evaluate_rules_batch(fuzzified, mfs, exam)
+        results[start:end], interps[start:end] = defuzzify_and_interpret_batch(aggregated, exam)
+    return results, interps
+
+# atbocsatokepesseg merese: soros ut vs. kotegelt ut 1 .. 10^6 bemenetre
+def benchmark_batch(sizes=(1, 10, 100, 1000, 10_000, 100_000, 1_000_000), seed=42):
+    import time
+
+    study, sleep, exam = build_universes()
+    mfs = build_membership_functions(study, sleep, exam)
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        study_vals = rng.uniform(0, 40, n)
+        sleep_vals = rng.uniform(0, 10, n)
+        t0 = time.perf_counter()
+        score_batch(study_vals, sleep_vals, study, sleep, exam, mfs)
+        batch_time = time.perf_counter() - t0
+        line = f"n = {n:8d}: batch {batch_time * 1000:9.2f} ms ({n / batch_time:12.0f} bemenet/s)"
+        if n <= 10_000:
+            t0 = time.perf_counter()
+            for study_val, sleep_val in zip(study_vals, sleep_vals):
+                fuzzified = fuzzify_inputs(study_val, sleep_val, study, sleep, mfs)
+                rules, aggregated = evaluate_rules(fuzzified, mfs, exam)
+                if aggregated.sum() > 0:
+                    defuzzify_and_interpret(aggregated, exam)
+            single_time = time.perf_counter() - t0
+            line += f", soros {single_time * 1000:9.2f} ms ({n / single_time:9.0f} bemenet/s)"
+        print(line)
+
+# analitikus ut: a tagsagi fuggvenyek es a szabalyok (MF_PARAMS, RULES) alapjan, univerzum-tombok nelkul
+# minden halmaz trapez (a, b, c, d); a trimf [a, b, c] a (a, b, b, c) trapez
+# a levagott kimeneti halmazok maximuma szakaszonkent linearis, igy a sulypont pontosan
+# kiszamolhato a toresponotokbol (~40 pont soronkent, az univerzum felbontasatol fuggetlenul)
+EXAM_RANGE = (0.0, 100.0)
+
+def trapezoid_params(name):
+    shape, params = MF_PARAMS[name][1:]
+    return tuple(params) if shape == "trapmf" else (params[0], params[1], params[1], params[2])
+
+# trapez tagsagi fuggveny tetszoleges alaku x-re; a == b / c == d eseten (vall) a fel- / lefuto el fuggoleges
+def trapezoid(x, params):
+    a, b, c, d = params
+    x = np.asarray(x, dtype=float)
+    rise = np.clip((x - a) / (b - a), 0.0, 1.0) if b > a else (x >= a).astype(float)
+    fall = np.clip((d - x) / (d - c), 0.0, 1.0) if d > c else (x <= d).astype(float)
+    return np.fmin(rise, fall)
+
+# kimeneti halmazonkenti levagasi magassag: a halmazra mutato szabalyok sulyozott aktivaciojanak maximuma
+def output_heights(fuzzified):
+    outputs = [name for name, (universe, _, _) in MF_PARAMS.items() if universe == "exam"]
+    heights = {name: 0.0 for name in outputs}
+    for rule in RULES:
+        heights[rule.consequent] = np.fmax(heights[rule.consequent], rule_activation(rule, fuzzified) * rule.weight)
+    return outputs, np.stack([np.broadcast_to(heights[name], np.shape(fuzzified[RULES[0].antecedents[0]]))
+                              for name in outputs], axis=-1)
+
+# a kimeneti halmazok ferde egyenesei (y = m * x + q) es az allando toresponotok
+def _output_lines(outputs, lo, hi):
+    slopes, fixed = [], [lo, hi]
+    for name in outputs:
+        a, b, c, d = trapezoid_params(name)
+        fixed += [a, b, c, d]
+        if b > a:
+            slopes.append((1.0 / (b - a), -a / (b - a)))
+        if d > c:
+            slopes.append((-1.0 / (d - c), d / (d - c)))
+    # ket ferde egyenes metszespontja (csak a halmazok alakjatol fugg)
+    for i, (m1, q1) in enumerate(slopes):
+        for m2, q2 in slopes[i + 1:]:
+            if m1 != m2:
+                fixed.append((q2 - q1) / (m1 - m2))
+    fixed = np.array([x for x in fixed if lo <= x <= hi])
+    return np.array(slopes), fixed
+
+# analitikus centroid: heights (batch x kimeneti halmaz) -> (eredmeny, ertelmezes)
+# a tores- es metszespontok kozott az aggregalt halmaz linearis, ezert a szakaszonkenti
+# trapez-keplet (mint defuzzify_and_interpret_batch-ben) itt pontos
+def defuzzify_analytic(heights, outputs, lo=EXAM_RANGE[0], hi=EXAM_RANGE[1]):
+    heights = np.atleast_2d(heights)
+    slopes, fixed = _output_lines(outputs, lo, hi)
+    m, q = slopes[:, 0], slopes[:, 1]
+    # vizszintes levagasi egyenesek (y = h) metszese a ferde egyenesekkel, soronkent
+    cuts = (heights[:, :, None] - q[None, None, :]) / m[None, None, :]
+    cuts = np.clip(cuts.reshape(len(heights), -1), lo, hi)
+    points = np.sort(np.concatenate([np.broadcast_to(fixed, (len(heights), len(fixed))), cuts], axis=1), axis=1)
+
+    values = np.zeros_like(points)
+    for k, name in enumerate(outputs):
+        np.fmax(values, np.fmin(heights[:, k:k + 1], trapezoid(points, trapezoid_params(name))), out=values)
+
+    dx = np.diff(points, axis=1)
+    y1, y2 = values[:, :-1], values[:, 1:]
+    area = 0.5 * dx * (y1 + y2)
+    moment = area * points[:, :-1] + dx * dx * (y1 + 2.0 * y2) / 6.0
+    sum_area = area.sum(axis=1)
+    result = moment.sum(axis=1) / np.fmax(sum_area, np.finfo(float).eps)
+    result[sum_area == 0] = np.nan
+    interp = np.where(result < 50, "fail", np.where(result < 75, "pass", "excellent"))
+    interp[np.isnan(result)] = ""
+    return result, interp
+
+# teljes analitikus pontozas: fuzzifikacio trapezokkal, szabalyok a RULES alapjan, analitikus centroid
+def score_analytic(study_vals, sleep_vals):
+    study_vals = np.atleast_1d(np.asarray(study_vals, dtype=float))
+    sleep_vals = np.atleast_1d(np.asarray(sleep_vals, dtype=float))
+    inputs = {"study": study_vals, "sleep": sleep_vals}
+    fuzzified = {name: trapezoid(inputs[universe], trapezoid_params(name))
+                 for name, (universe, _, _) in MF_PARAMS.items() if universe in inputs}
+    outputs, heights = output_heights(fuzzified)
+    return defuzzify_analytic(heights, outputs)
+
+# analitikus ut vs. diszkretizalt ut: elteres a finom (0.001-es) es az alap (1-es) exam univerzumhoz kepest,
+# valamint atbocsatokepesseg
+def benchmark_analytic(n=100_000, n_fine=2000, seed=42):
+    import time
+
+    study, sleep, exam = build_universes()
+    mfs = build_membership_functions(study, sleep, exam)
+    rng = np.random.default_rng(seed)
+    study_vals = rng.uniform(0, 40, n)
+    sleep_vals = rng.uniform(0, 10, n)
+
+    t0 = time.perf_counter()
+    analytic, _ = score_analytic(study_vals, sleep_vals)
+    analytic_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    discrete, _ = score_batch(study_vals, sleep_vals, study, sleep, exam, mfs)
+    discrete_time = time.perf_counter() - t0
+    print(f"analitikus: {n / analytic_time:10.0f} bemenet/s, diszkret (101 pont): {n / discrete_time:10.0f} bemenet/s")
+    print(f"elteres a 101 pontos univerzumtol: max {np.nanmax(np.abs(analytic - discrete)):.4f}")
+
+    fine_exam = np.linspace(0, 100, 100_001)
+    fine_mfs = build_membership_functions(study, sleep, fine_exam)
+    fine, _ = score_batch(study_vals[:n_fine], sleep_vals[:n_fine], study, sleep, fine_exam, fine_mfs, chunk_size=64)
+    print(f"elteres a 100001 pontos univerzumtol: max {np.nanmax(np.abs(analytic[:n_fine] - fine)):.2e}")
+    for i, (study_val, sleep_val) in enumerate([(2, 2), (20, 6), (35, 9)], start=1):
+        print(f"eset {i}: analitikus {fmt(score_analytic(study_val, sleep_val)[0][0])}, "
+              f"diszkret {fmt(score_batch(study_val, sleep_val, study, sleep, exam, mfs)[0][0])}")
+
+# folyamatos (streaming) pontozas egyesevel erkezo bemenetekre, allando memoriaval
+# a munkatombok (levagott halmaz, aggregalt halmaz, centroid szakaszai) egyszer, az univerzumhoz
+# foglalodnak le; a hivasonkenti lepesek out= parameterrel, helyben dolgoznak
+# a szabalyleirasok (rules lista) csak trace=True eseten keszulnek el (last_rules)
+class StreamingScorer:
+    def __init__(self, study, sleep, exam, mfs, trace=False):
+        self.study, self.sleep, self.exam, self.mfs = study, sleep, exam, mfs
+        self.trace = trace
+        self.last_rules = []
+        self.inputs = [(name, study if universe == "study" else sleep, mfs[name])
+                       for name, (universe, _, _) in MF_PARAMS.items() if universe != "exam"]
+        self.fuzzified = {}
+        x = np.asarray(exam, dtype=float)
+        self.x1 = x[:-1].copy()
+        self.dx = np.diff(x)
+        self.half_dx = 0.5 * self.dx
+        self.half_dx_x1 = self.half_dx * self.x1
+        self.dx2_6 = self.dx * self.dx / 6.0
+        n = len(exam)
+        self.clipped = np.empty(n)
+        self.aggregated = np.empty(n)
+        self.area = np.empty(n - 1)
+        self.moment = np.empty(n - 1)
+
+    def score(self, study_val, sleep_val):
+        fuzzified = self.fuzzified
+        for name, universe, mf in self.inputs:
+            # left / right = 0: az univerzumon kivul nulla tagsag, mint fuzz.interp_membership-nel
+            fuzzified[name] = float(np.interp(study_val if universe is self.study else sleep_val, universe, mf,
+                                              left=0.0, right=0.0))
+
+        aggregated, clipped = self.aggregated, self.clipped
+        aggregated.fill(0.0)
+        if self.trace:
+            self.last_rules = []
+        for rule in RULES:
+            values = [fuzzified[name] for name in rule.antecedents]
+            act = min(values) if rule.connective == "and" else max(values)
+            clip = act * rule.weight if rule.weight != 1.0 else act
+            np.fmin(self.mfs[rule.consequent], clip, out=clipped)
+            np.fmax(aggregated, clipped, out=aggregated)
+            if self.trace:
+                self.last_rules.append((rule.description, act, clipped.copy()))
+        return self._defuzzify()
+
+    # ugyanaz a szakaszonkenti centroid keplet, mint defuzzify_and_interpret_batch-ben
+    def _defuzzify(self):
+        y, area, moment = self.aggregated, self.area, self.moment
+        np.add(y[:-1], y[1:], out=area)
+        sum_area = np.dot(area, self.half_dx)
+        if sum_area == 0:
+            return float("nan"), ""
+        np.multiply(y[1:], 2.0, out=moment)
+        moment += y[:-1]
+        result = (np.dot(area, self.half_dx_x1) + np.dot(moment, self.dx2_6)) / sum_area
+        if result < 50:
+            return result, "fail"
+        if result < 75:
+            return result, "pass"
+        return result, "excellent"
+
+    # bemenetek (study, sleep) iteratorat dolgozza fel, lustan, egyesevel adja vissza az eredmenyt
+    def score_stream(self, pairs):
+        for study_val, sleep_val in pairs:
+            yield self.score(study_val, sleep_val)
+
+# streaming pontozo vs. eredeti soros ut: hivasonkenti kesleltetes es tracemalloc-kal mert
+# atmeneti memoria (hivasonkenti csucs) es memorianovekedes hosszu folyamnal
+def benchmark_streaming(n=20_000, seed=42):
+    import time
+    import tracemalloc
+
+    study, sleep, exam = build_universes()
+    mfs = build_membership_functions(study, sleep, exam)
+    rng = np.random.default_rng(seed)
+    pairs = list(zip(rng.uniform(0, 40, n).tolist(), rng.uniform(0, 10, n).tolist()))
+
+    def original(study_val, sleep_val):
+        fuzzified = fuzzify_inputs(study_val, sleep_val, study, sleep, mfs)
+        rules, aggregated = evaluate_rules(fuzzified, mfs, exam)
+        if aggregated.sum() > 0:
+            return defuzzify_and_interpret(aggregated, exam)
+        return float("nan"), ""
+
+    scorer = StreamingScorer(study, sleep, exam, mfs)
+    traced = StreamingScorer(study, sleep, exam, mfs, trace=True)
+    for label, fn in (("eredeti", original), ("streaming", scorer.score), ("streaming+trace", traced.score)):
+        t0 = time.perf_counter()
+        results = [fn(study_val, sleep_val)[0] for study_val, sleep_val in pairs]
+        elapsed = time.perf_counter() - t0
+
+        # atmeneti memoria egy hivas alatt: csucs - kiindulo allapot, 200 hivas atlaga
+        tracemalloc.start()
+        peaks, blocks = [], []
+        for study_val, sleep_val in pairs[:200]:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn(study_val, sleep_val)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+        print(f"{label:16s}: {elapsed / n * 1e6:7.1f} us/hivas, atmeneti csucs {np.mean(peaks):8.0f} B/hivas")
+        if label == "eredeti":
+            reference = np.array(results)
+        else:
+            print(f"{'':16s}  max elteres az eredeti uttol: {np.nanmax(np.abs(np.array(results) - reference)):.2e}")
+
+    # allando memoria: a streaming pontozo memoriaja nem no a feldolgozott bemenetek szamaval
+    # (a bemenetek is lustan, egyesevel keletkeznek)
+    tracemalloc.start()
+    stream = scorer.score_stream((rng.uniform(0, 40), rng.uniform(0, 10)) for _ in range(10 * n))
+    for i, _ in enumerate(stream, start=1):
+        if i == 1000:
+            start_mem = tracemalloc.get_traced_memory()[0]
+    end_mem, peak_mem = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"folyam {10 * n} bemenet: memoria {start_mem} -> {end_mem} B (csucs {peak_mem} B)")
+
+# elore kiszamolt vezerlesi felulet: a teljes fuzzy rendszer egy 2D tablazatba "forditva"
+# (study x sleep racs, a cellakban a defuzzifikalt vizsgaeredmeny); a lekerdezes bilinearis
+# interpolacio, a tablazat lemezre mentheto, a tagsagi fuggvenyek hash-evel kulcsolva
+# ahol a racscella valamelyik sarka NaN (nincs aktiv szabaly), vagy a sarkok kozti elteres
+# nagyobb max_spread-nel (meredek / szakadasos resz, pl. az ures kimeneti halmaz hataran),
+# ott a pontos ut szamol
+STUDY_RANGE = (0.0, 40.0)
+SLEEP_RANGE = (0.0, 10.0)
+
+# a tagsagi fuggvenyek es az univerzumok hash-e (ha barmelyik parameter valtozik, ez is valtozik)
+def mf_hash(study, sleep, exam, mfs, n_study, n_sleep):
+    import hashlib
+
+    digest = hashlib.sha1(f"{n_study}x{n_sleep}".encode())
+    for arr in (study, sleep, exam):
+        digest.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+    for name in sorted(mfs):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(mfs[name], dtype=float).tobytes())
+    return digest.hexdigest()
+
+class ControlSurface:
+    def __init__(self, study_grid, sleep_grid, table, universes, mfs, max_spread=2.0):
+        self.study_grid = study_grid
+        self.sleep_grid = sleep_grid
+        self.table = table  # (len(study_grid), len(sleep_grid))
+        self.universes = universes  # (study, sleep, exam) a pontos tartalek uthoz
+        self.mfs = mfs
+        # cellankent: interpolalhato-e (a NaN osszehasonlitasok False-t adnak, igy azok kiesnek)
+        corners = np.stack([table[:-1, :-1], table[1:, :-1], table[:-1, 1:], table[1:, 1:]])
+        self.smooth = (corners.max(axis=0) - corners.min(axis=0)) <= max_spread
+
+    # a tablazat kiszamitasa a kotegelt pontos uttal
+    @classmethod
+    def compile(cls, study, sleep, exam, mfs, n_study=161, n_sleep=101, max_spread=2.0):
+        study_grid = np.linspace(*STUDY_RANGE, n_study)
+        sleep_grid = np.linspace(*SLEEP_RANGE, n_sleep)
+        study_vals, sleep_vals = np.meshgrid(study_grid, sleep_grid, indexing="ij")
+        table, _ = score_batch(study_vals.ravel(), sleep_vals.ravel(), study, sleep, exam, mfs)
+        return cls(study_grid, sleep_grid, table.reshape(n_study, n_sleep), (study, sleep, exam), mfs, max_spread)
+
+    # betoltes a gyorsitotarbol (.npy), vagy kiszamitas es mentes
+    @classmethod
+    def load_or_compile(cls, study, sleep, exam, mfs, n_study=161, n_sleep=101, max_spread=2.0, cache_dir=None):
+        import os
+        import tempfile
+
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), "fuzzy_surface_cache")
+        path = os.path.join(cache_dir, mf_hash(study, sleep, exam, mfs, n_study, n_sleep) + ".npy")
+        if os.path.exists(path):
+            study_grid = np.linspace(*STUDY_RANGE, n_study)
+            sleep_grid = np.linspace(*SLEEP_RANGE, n_sleep)
+            return cls(study_grid, sleep_grid, np.load(path), (study, sleep, exam), mfs, max_spread)
+        surface = cls.compile(study, sleep, exam, mfs, n_study, n_sleep, max_spread)
+        os.makedirs(cache_dir, exist_ok=True)
+        # atomi csere: egy felbemaradt vagy parhuzamos iras ne hagyjon csonka tablat a cache-ben
+        tmp_path = path + f".{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.save(fh, surface.table)
+        os.replace(tmp_path, path)
+        return surface
+
+    # bilinearis interpolacio; a tartomanyon kivuli bemeneteket a hatarra vagjuk
+    def predict(self, study_vals, sleep_vals):
+        study_vals = np.clip(np.atleast_1d(np.asarray(study_vals, dtype=float)), *STUDY_RANGE)
+        sleep_vals = np.clip(np.atleast_1d(np.asarray(sleep_vals, dtype=float)), *SLEEP_RANGE)
+        sg, lg, table = self.study_grid, self.sleep_grid, self.table
+        # egyenletes racs: a cellaindex kozvetlenul szamolhato
+        fi = (study_vals - sg[0]) / (sg[1] - sg[0])
+        fj = (sleep_vals - lg[0]) / (lg[1] - lg[0])
+        i = np.minimum(fi.astype(np.int64), len(sg) - 2)
+        j = np.minimum(fj.astype(np.int64), len(lg) - 2)
+        ti = fi - i
+        tj = fj - j
+        result = ((1 - ti) * (1 - tj) * table[i, j] + ti * (1 - tj) * table[i + 1, j]
+                  + (1 - ti) * tj * table[i, j + 1] + ti * tj * table[i + 1, j + 1])
+        missing = ~self.smooth[i, j]
+        if missing.any():
+            study, sleep, exam = self.universes
+            result[missing], _ = score_batch(study_vals[missing], sleep_vals[missing], study, sleep, exam, self.mfs)
+        return result
+
+    # empirikus hibakorlat a pontos uthoz kepest: a cellak kozeppontjaiban (ahol a bilinearis
+    # interpolacio hibaja jellemzoen a legnagyobb) es n_random veletlen pontban
+    def error_report(self, n_random=100_000, seed=0):
+        study, sleep, exam = self.universes
+        sg, lg = self.study_grid, self.sleep_grid
+        mid_s, mid_l = np.meshgrid((sg[:-1] + sg[1:]) / 2, (lg[:-1] + lg[1:]) / 2, indexing="ij")
+        rng = np.random.default_rng(seed)
+        study_vals = np.concatenate([mid_s.ravel(), rng.uniform(*STUDY_RANGE, n_random)])
+        sleep_vals = np.concatenate([mid_l.ravel(), rng.uniform(*SLEEP_RANGE, n_random)])
+        exact, _ = score_batch(study_vals, sleep_vals, study, sleep, exam, self.mfs)
+        error = np.abs(self.predict(study_vals, sleep_vals) - exact)
+        error = error[~np.isnan(error)]
+        return {"max": float(error.max()), "p99": float(np.percentile(error, 99)), "mean": float(error.mean())}
+
+# vezerlesi felulet: hiba es sebesseg kulonbozo racsfelbontasoknal
+def benchmark_surface(resolutions=((41, 11), (161, 101), (401, 201), (801, 401)), n=100_000, seed=42):
+    import time
+
+    study, sleep, exam = build_universes()
+    mfs = build_membership_functions(study, sleep, exam)
+    rng = np.random.default_rng(seed)
+    study_vals = rng.uniform(*STUDY_RANGE, n)
+    sleep_vals = rng.uniform(*SLEEP_RANGE, n)
+
+    t0 = time.perf_counter()
+    score_batch(study_vals, sleep_vals, study, sleep, exam, mfs)
+    exact_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        fuzzified = fuzzify_inputs(20.0, 6.0, study, sleep, mfs)
+        defuzzify_and_interpret(evaluate_rules(fuzzified, mfs, exam)[1], exam)
+    single_time = (time.perf_counter() - t0) / 1000
+    print(f"pontos ut: soros {single_time * 1e6:.0f} us/bemenet, kotegelt {n / exact_time:.0f} bemenet/s")
+
+    for n_study, n_sleep in resolutions:
+        t0 = time.perf_counter()
+        surface = ControlSurface.compile(study, sleep, exam, mfs, n_study, n_sleep)
+        compile_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        surface.predict(study_vals, sleep_vals)
+        lut_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            surface.predict(20.0, 6.0)
+        single_lut = (time.perf_counter() - t0) / 1000
+        errors = surface.error_report()
+        print(f"racs {n_study:4d} x {n_sleep:4d}: forditas {compile_time:6.2f} s, "
+              f"{n / lut_time:10.0f} bemenet/s, egy lekerdezes {single_lut * 1e6:4.0f} us, "
+              f"pontos cellak {1 - surface.smooth.mean():.2%}, "
+              f"hiba max {errors['max']:.4f} / p99 {errors['p99']:.4f} / atlag {errors['mean']:.5f}")
+
+# pontozo szolgaltatas: JSON sorok (stdin vagy helyi TCP socket), keres: {"id": .., "study": .., "sleep": ..}
+# valasz: {"id": .., "result": .. (null, ha nincs aktiv szabaly), "interp": ..}
+# a beerkezo kereseket max_delay ideig gyujti (micro-batching), majd egyben kuldi at a kotegelt
+# kiertekelesen (score_batch); offload_size-nal nagyobb kotegek process poolba kerulnek
+_SERVICE_SYSTEM = None
+
+def _service_system():
+    global _SERVICE_SYSTEM
+    if _SERVICE_SYSTEM is None:
+        study, sleep, exam = build_universes()
+        _SERVICE_SYSTEM = (study, sleep, exam, build_membership_functions(study, sleep, exam))
+    return _SERVICE_SYSTEM
+
+# egy koteg kiertekelese (a process pool worker is ezt hivja)
+def score_requests(study_vals, sleep_vals):
+    study, sleep, exam, mfs = _service_system()
+    results, interps = score_batch(study_vals, sleep_vals, study, sleep, exam, mfs)
+    return results.tolist(), interps.tolist()
+
+class ScoringService:
+    def __init__(self, max_delay=0.002, max_batch=4096, offload_size=2048, workers=None):
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.offload_size = offload_size
+        self.workers = workers
+        self.pool = None
+        self.queue = None
+        self.batcher = None
+        self.batch_sizes = []
+        self.connections = set()
+
+    async def start(self):
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.queue = asyncio.Queue()
+        _service_system()
+        if self.workers != 0:
+            # a workerek mar itt, a socketek megnyitasa elott elindulnak (fork eseten kulonben
+            # oroklik a kapcsolatok fajlleiroit, es a kliens lezarasa nem jutna el a szerverig)
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_service_system)
+            await asyncio.get_running_loop().run_in_executor(self.pool, _service_system)
+        self.batcher = asyncio.get_running_loop().create_task(self._batch_loop())
+        return self
+
+    # start() nelkul (vagy ismetelten) hivva sem hibazik
+    async def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+            self.batcher = None
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    # egy keres pontozasa: bekerul a sorba, a valasz a koteg kiertekelese utan erkezik
+    async def score(self, study_val, sleep_val):
+        import asyncio
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((float(study_val), float(sleep_val), future))
+        return await future
+
+    async def _batch_loop(self):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            self.batch_sizes.append(len(batch))
+
+            study_vals = [item[0] for item in batch]
+            sleep_vals = [item[1] for item in batch]
+            try:
+                if self.pool is not None and len(batch) >= self.offload_size:
+                    results, interps = await loop.run_in_executor(self.pool, score_requests, study_vals, sleep_vals)
+                else:
+                    results, interps = score_requests(study_vals, sleep_vals)
+            except Exception as exc:
+                for _, _, future in batch:
+                    if not future.cancelled():
+                        future.set_exception(exc)
+                continue
+            for (_, _, future), result, interp in zip(batch, results, interps):
+                if not future.cancelled():
+                    future.set_result((result, interp))
+
+    # egy JSON sor feldolgozasa -> valasz JSON sor
+    async def handle_line(self, line):
+        import json
+        import math
+
+        try:
+            request = json.loads(line)
+            result, interp = await self.score(request["study"], request["sleep"])
+            response = {"id": request.get("id"), "result": None if math.isnan(result) else result, "interp": interp}
+        except (ValueError, KeyError, TypeError) as exc:
+            response = {"error": str(exc)}
+        return json.dumps(response)
+
+    # stdin -> stdout JSON sorok; a keresek parhuzamosan futnak, a valaszok erkezesi sorrendben irodnak ki
+    async def serve_stdio(self):
+        import asyncio
+        import sys
+
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        pending = set()
+
+        async def answer(line):
+            print(await self.handle_line(line), flush=True)
+
+        while line := await reader.readline():
+            if line.strip():
+                task = loop.create_task(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+
+    # helyi TCP socket, kapcsolatonkent JSON sorok
+    async def serve_socket(self, host="127.0.0.1", port=8765):
+        import asyncio
+
+        async def handle(reader, writer):
+            connection = asyncio.current_task()
+            self.connections.add(connection)
+            connection.add_done_callback(self.connections.discard)
+            lock = asyncio.Lock()
+            pending = set()
+
+            async def answer(line):
+                response = await self.handle_line(line)
+                async with lock:
+                    writer.write(response.encode() + b"\n")
+                    await writer.drain()
+
+            while line := await reader.readline():
+                task = asyncio.get_running_loop().create_task(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+            writer.close()
+
+        return await asyncio.start_server(handle, host, port)
+
+# terhelesgenerator: a szolgaltatast helyi socketen inditja, clients db kapcsolat kuldi a kereseket
+# (kapcsolatonkent legfeljebb in_flight fuggo keres), kesleltetes p50/p99 es keres/s
+async def load_test(n_requests=20_000, clients=32, in_flight=8, seed=42, **service_options):
+    import asyncio
+    import json
+    import time
+
+    service = await ScoringService(**service_options).start()
+    server = await service.serve_socket(port=0)
+    port = server.sockets[0].getsockname()[1]
+    rng = np.random.default_rng(seed)
+    requests = [{"id": i, "study": float(a), "sleep": float(b)}
+                for i, (a, b) in enumerate(zip(rng.uniform(0, 40, n_requests), rng.uniform(0, 10, n_requests)))]
+    latencies = []
+
+    async def client(chunk):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        sent = {}
+        window = asyncio.Semaphore(in_flight)
+
+        async def receive():
+            for _ in chunk:
+                response = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - sent.pop(response["id"]))
+                window.release()
+
+        receiver = asyncio.get_running_loop().create_task(receive())
+        for request in chunk:
+            await window.acquire()
+            sent[request["id"]] = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+        await receiver
+        writer.close()
+        await writer.wait_closed()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(requests[i::clients]) for i in range(clients)))
+    elapsed = time.perf_counter() - t0
+    server.close()
+    if service.connections:
+        await asyncio.wait(service.connections)
+    await service.close()
+
+    latencies = np.array(latencies) * 1000
+    sizes = np.array(service.batch_sizes)
+    print(f"max_delay {service.max_delay * 1000:4.1f} ms, max_batch {service.max_batch:5d}: "
+          f"{n_requests / elapsed:8.0f} keres/s, p50 {np.percentile(latencies, 50):6.2f} ms, "
+          f"p99 {np.percentile(latencies, 99):6.2f} ms, atlagos koteg {sizes.mean():6.1f} ({len(sizes)} koteg, "
+          f"ebbol {(sizes >= service.offload_size).sum()} process poolban)")
+
+# terheleses meres: micro-batching nelkul (max_batch=1) es kulonbozo gyujtesi idokkel
+def benchmark_service(n_requests=20_000):
+    import asyncio
+
+    asyncio.run(load_test(n_requests, max_delay=0.0, max_batch=1, workers=0))
+    for max_delay in (0.001, 0.002, 0.005):
+        asyncio.run(load_test(n_requests, max_delay=max_delay))
+    # sok fuggo keres: offload_size feletti kotegek a process poolba kerulnek
+    asyncio.run(load_test(n_requests, clients=64, in_flight=64, max_delay=0.002))
+
 def main():
     # univerzumok es tagsagi fuggvenyek letrehozasa
     study, sleep, exam = build_universes()
@@ -164,7 +814,45 @@ def main():
         print(f"defuzzified exam_result = {fmt(result)} / 100")
         print(f"interpretacio: {interp}\n")
 
-main()
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench", action="store_true", help="soros es kotegelt kiertekeles atbocsatokepessege")
+    parser.add_argument("--bench-surface", action="store_true", help="elore kiszamolt vezerlesi felulet merese")
+    parser.add_argument("--serve", action="store_true", help="pontozo szolgaltatas: JSON sorok stdin-rol stdout-ra")
+    parser.add_argument("--serve-port", type=int, help="pontozo szolgaltatas helyi TCP porton")
+    parser.add_argument("--load-test", action="store_true", help="terhelesgenerator a pontozo szolgaltatasra")
+    parser.add_argument("--bench-stream", action="store_true", help="streaming pontozo kesleltetese es memoriaja")
+    parser.add_argument("--bench-analytic", action="store_true", help="analitikus centroid vs. diszkretizalt univerzum")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark_batch()
+    elif args.bench_surface:
+        benchmark_surface()
+    elif args.bench_analytic:
+        benchmark_analytic()
+    elif args.bench_stream:
+        benchmark_streaming()
+    elif args.serve or args.serve_port:
+        import asyncio
+
+        async def serve():
+            service = await ScoringService().start()
+            try:
+                if args.serve_port:
+                    server = await service.serve_socket(port=args.serve_port)
+                    async with server:
+                        await server.serve_forever()
+                else:
+                    await service.serve_stdio()
+            finally:
+                await service.close()
+
+        asyncio.run(serve())
+    elif args.load_test:
+        benchmark_service()
+    else:
+        main()
 
 # kerdesek:
 # fuzzifikacio: a konkret bemeneteket tagsagi ertekekke alakitjuk, hogy kezeljuk a bizonytalansagot
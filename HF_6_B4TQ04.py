@@ -1,4 +1,5 @@
 ﻿import random
+import time
 import numpy as np
 from typing import Tuple
 
@@ -47,9 +48,10 @@ def mutate(x: float, mutation_rate: float, rng: np.random.Generator) -> float:
 
 # egy generaciot allit elo a genetikus algoritmusban
 # visszaadja az uj populaciot es elvegzi a feladat altal kert naplozast
-def run_generation(pop: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, dict]:
+# n: az uj populacio merete
+def run_generation(pop: np.ndarray, rng: np.random.Generator, objective=f, n: int = N) -> Tuple[np.ndarray, dict]:
     # 1. minden egyedre fitness kiszamitasa
-    fitness = f(pop)
+    fitness = objective(pop)
 
     # 2. legjobb egyedek megtartasa
     # fitnezz szerint sorba rendezes
@@ -59,7 +61,7 @@ def run_generation(pop: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarra
 
     # 3. uj egyedek eloallitasa
     new_pop = []
-    while len(new_pop) < N - E:
+    while len(new_pop) < n - E:
         # 3a. szulok kivalasztasa
         p1_idx = tournament_selection(pop, fitness, k, rng)
         p2_idx = tournament_selection(pop, fitness, k, rng)
@@ -77,24 +79,496 @@ def run_generation(pop: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarra
     new_pop = np.array(new_pop) # uj utodokbol kepzett tomb
     next_pop = np.concatenate([elites, new_pop]) # elitek hozzaadasa az iment tombhoz
 
-    # naplozas
+    # naplozas (az uj populacio fitness-e egyszer szamolodik)
+    next_fitness = objective(next_pop)
     logs = {
-        "legjobb_fitness_ertek": float(np.max(f(next_pop))),
-        "atlagos_fitness_ertek": float(np.mean(f(next_pop))),
-        "fitness_ertekek_szorasa": float(np.std(f(next_pop))),
-        "legjobb_x_ertek": float(next_pop[np.argmax(f(next_pop))])
+        "legjobb_fitness_ertek": float(np.max(next_fitness)),
+        "atlagos_fitness_ertek": float(np.mean(next_fitness)),
+        "fitness_ertekek_szorasa": float(np.std(next_fitness)),
+        "legjobb_x_ertek": float(next_pop[np.argmax(next_fitness)])
     }
 
     return next_pop, logs
 
+# vektorizalt tornaszelekcio: (2 x n_children) szulo index, tornankent k jeloltbol
+# a jelolteken egyesevel halad (k kicsi); egyenloseg eseten az elso jelolt nyer, mint argmax-nal
+def tournament_winners(fitness: np.ndarray, n_children: int, k: int, rng: np.random.Generator) -> np.ndarray:
+    idx = rng.integers(0, len(fitness), size=(k, 2, n_children))
+    winners = idx[0]
+    best_fitness = fitness[winners]
+    for candidates in idx[1:]:
+        candidate_fitness = fitness[candidates]
+        better = candidate_fitness > best_fitness
+        winners = np.where(better, candidates, winners)
+        best_fitness = np.where(better, candidate_fitness, best_fitness)
+    return winners
+
+# elitek indexei: argpartition O(n), majd az E legjobb sorba rendezese (mint argsort(...)[-E:])
+def elite_indices(fitness: np.ndarray, elite: int) -> np.ndarray:
+    if not elite:
+        return np.empty(0, dtype=int)
+    n = len(fitness)
+    top = np.argpartition(fitness, n - elite)[n - elite:]
+    return top[np.argsort(fitness[top])]
+
+# fazisidok gyujtese: t0..t4 a fazishatarok idopontjai
+PHASES = ("selection", "crossover", "mutation", "evaluation")
+
+def _add_timings(timings: dict, *marks: float):
+    for phase, start, end in zip(PHASES, marks, marks[1:]):
+        timings[phase] = timings.get(phase, 0.0) + end - start
+
+# vektorizalt generacio: a teljes uj populacio nehany NumPy muvelettel all elo
+# a fitness generacionkent egyszer szamolodik: a bemeno populacio fitness-et a hivo adja at,
+# a kovetkezo populaciot kiertekeli, es visszaadja (a naplo is ebbol keszul)
+# reprodukalhatosag: ugyanazzal a seed-del es parameterekkel a futas bitre azonos; a huzasok
+# sorrendje generacionkent rogzitett: tornaindexek (k x 2 x (n - E)), keresztezesi 'a'
+# egyutthatok (n - E), Gauss-zaj (n - E); a soros run_generation-nel nem egyezik, mert ott
+# a huzasok utodonkent valtakoznak
+# timings megadasakor a fazisok ideje (selection, crossover, mutation, evaluation) hozzaadodik
+def run_generation_vectorized(pop: np.ndarray, fitness: np.ndarray, rng: np.random.Generator,
+                              k: int = k, mutation_rate: float = mutation_rate, elite: int = E,
+                              objective=f, timings: dict = None) -> Tuple[np.ndarray, np.ndarray, dict]:
+    t0 = time.perf_counter()
+    n = len(pop)
+    n_children = n - elite
+    elites = pop[elite_indices(fitness, elite)]
+
+    # tornaszelekcio: mindket szulo, minden utod, k jelolt egyszerre
+    winners = tournament_winners(fitness, n_children, k, rng)
+    x1 = pop[winners[0]]
+    x2 = pop[winners[1]]
+    t1 = time.perf_counter()
+
+    # aritmetikai keresztezes es mutacio a teljes utodtombon
+    a = rng.random(n_children)
+    children = a * x1 + (1 - a) * x2
+    t2 = time.perf_counter()
+    children += rng.normal(0, mutation_rate, n_children)
+    np.clip(children, 0.0, 1.0, out=children)
+
+    next_pop = np.concatenate([elites, children])
+    t3 = time.perf_counter()
+    next_fitness = objective(next_pop)
+    if timings is not None:
+        _add_timings(timings, t0, t1, t2, t3, time.perf_counter())
+    best = int(np.argmax(next_fitness))
+    logs = {
+        "legjobb_fitness_ertek": float(next_fitness[best]),
+        "atlagos_fitness_ertek": float(next_fitness.mean()),
+        "fitness_ertekek_szorasa": float(next_fitness.std()),
+        "legjobb_x_ertek": float(next_pop[best])
+    }
+    return next_pop, next_fitness, logs
+
+# soros vs. vektorizalt generacio ideje kulonbozo populaciomereteknel
+def benchmark_generation(sizes=(50, 1000, 10_000, 100_000, 1_000_000), generations: int = 5):
+    for n in sizes:
+        rng = np.random.default_rng(random_seed)
+        pop = init_population(n, rng)
+        fitness = f(pop)
+        t0 = time.perf_counter()
+        for _ in range(generations):
+            pop, fitness, _ = run_generation_vectorized(pop, fitness, rng)
+        vec_time = (time.perf_counter() - t0) / generations
+        line = f"N = {n:8d}: vektorizalt {vec_time * 1000:9.2f} ms/generacio"
+        if n <= 10_000:
+            rng = np.random.default_rng(random_seed)
+            pop = init_population(n, rng)
+            t0 = time.perf_counter()
+            for _ in range(generations):
+                pop, _ = run_generation(pop, rng, n=n)
+            assert len(pop) == n, f"a soros generacio {len(pop)} egyedet adott, elvart: {n}"
+            loop_time = (time.perf_counter() - t0) / generations
+            line += f", soros {loop_time * 1000:9.2f} ms/generacio ({loop_time / vec_time:6.1f}x)"
+        print(line)
+
+# tobbdimenzios genom: a populacio (n x dim) tomb, dimenziononkenti hatarokkal (bounds: dim x 2, [also, felso])
+# a muveletek a teljes matrixon dolgoznak: tornaszelekcio, blend (BLX-alpha) keresztezes es a hatarokra
+# vagott Gauss-mutacio (szoras: mutation_rate * a dimenzio szelessege)
+def init_population_nd(n: int, bounds: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    bounds = np.asarray(bounds, dtype=float)
+    return bounds[:, 0] + (bounds[:, 1] - bounds[:, 0]) * rng.random((n, len(bounds)))
+
+# egy generacio (n x dim) populacion; a fitness itt is generacionkent egyszer szamolodik
+# huzasok sorrendje: tornaindexek (k x 2 x (n - E)), BLX egyutthatok ((n - E) x dim), Gauss-zaj ((n - E) x dim)
+def run_generation_nd(pop: np.ndarray, fitness: np.ndarray, rng: np.random.Generator, bounds: np.ndarray,
+                      objective, k: int = k, mutation_rate: float = mutation_rate, elite: int = E,
+                      alpha: float = 0.5, timings: dict = None) -> Tuple[np.ndarray, np.ndarray, dict]:
+    t0 = time.perf_counter()
+    n, dims = pop.shape
+    n_children = n - elite
+    bounds = np.asarray(bounds, dtype=float)
+    lower, upper = bounds[:, 0], bounds[:, 1]
+
+    winners = tournament_winners(fitness, n_children, k, rng)
+    x1 = pop[winners[0]]
+    x2 = pop[winners[1]]
+    t1 = time.perf_counter()
+
+    # blend keresztezes: genenkent u ~ U(-alpha, 1 + alpha), utod = x1 + u * (x2 - x1)
+    children = rng.uniform(-alpha, 1 + alpha, (n_children, dims))
+    x2 -= x1
+    children *= x2
+    children += x1
+    del x1, x2
+    t2 = time.perf_counter()
+
+    # korlatos Gauss-mutacio
+    noise = rng.standard_normal((n_children, dims))
+    noise *= mutation_rate * (upper - lower)
+    children += noise
+    del noise
+    np.clip(children, lower, upper, out=children)
+
+    next_pop = np.concatenate([pop[elite_indices(fitness, elite)], children])
+    t3 = time.perf_counter()
+    next_fitness = objective(next_pop)
+    if timings is not None:
+        _add_timings(timings, t0, t1, t2, t3, time.perf_counter())
+    best = int(np.argmax(next_fitness))
+    logs = {
+        "legjobb_fitness_ertek": float(next_fitness[best]),
+        "atlagos_fitness_ertek": float(next_fitness.mean()),
+        "fitness_ertekek_szorasa": float(next_fitness.std()),
+        "legjobb_x": next_pop[best].copy()
+    }
+    return next_pop, next_fitness, logs
+
+# standard tesztfuggvenyek fitness-kent (a GA maximalizal, ezert a minimalizalando ertek -1-szerese)
+# rastrigin: minimum 0 az origoban, szokasos hatarok [-5.12, 5.12]
+def rastrigin(x: np.ndarray) -> np.ndarray:
+    return -(10.0 * x.shape[1] + np.sum(x * x - 10.0 * np.cos(2 * np.pi * x), axis=1))
+
+# rosenbrock: minimum 0 az (1, ..., 1) pontban, szokasos hatarok [-2.048, 2.048]
+def rosenbrock(x: np.ndarray) -> np.ndarray:
+    head, tail = x[:, :-1], x[:, 1:]
+    return -np.sum(100.0 * (tail - head * head) ** 2 + (1.0 - head) ** 2, axis=1)
+
+# generacionkenti ido dim es N fuggvenyeben, Rastrigin es Rosenbrock fuggvenyen
+def benchmark_nd(dims_list=(50, 200, 500), sizes=(1000, 10_000, 50_000), generations: int = 10):
+    for name, objective, limit in (("rastrigin", rastrigin, 5.12), ("rosenbrock", rosenbrock, 2.048)):
+        for dims in dims_list:
+            bounds = np.tile([-limit, limit], (dims, 1))
+            for n in sizes:
+                rng = np.random.default_rng(random_seed)
+                pop = init_population_nd(n, bounds, rng)
+                fitness = objective(pop)
+                start = float(fitness.max())
+                t0 = time.perf_counter()
+                for _ in range(generations):
+                    pop, fitness, logs = run_generation_nd(pop, fitness, rng, bounds, objective=objective,
+                                                           mutation_rate=0.01)
+                elapsed = (time.perf_counter() - t0) / generations
+                print(f"{name:10s} dim = {dims:3d}, N = {n:6d}: {elapsed * 1000:9.2f} ms/generacio "
+                      f"({elapsed / (n * dims) * 1e9:5.2f} ns/gen), "
+                      f"legjobb {start:.1f} -> {logs['legjobb_fitness_ertek']:.1f}")
+
+# futasvezerlo: korai leallitas es generacionkenti meresek
+# leall, ha window generacio alatt a legjobb fitness legfeljebb best_tol-lal javult, vagy (std_tol
+# megadasakor) a fitness szorasa legfeljebb std_tol-lal valtozott, vagy elfogyott az ido- (max_time, s)
+# vagy kiertekelesi keret (max_evaluations), legkesobb max_generations utan
+# a nyomkovetes (trace) egy strukturalt NumPy tomb, generacionkent egy sor: fitness statisztika,
+# fazisidok, ossz ido es kiertekelesek szama; .npy vagy .csv fajlba mentheto (save_trace)
+TRACE_DTYPE = np.dtype([("gen", np.int32), ("best", np.float64), ("mean", np.float64), ("std", np.float64),
+                        ("selection", np.float64), ("crossover", np.float64), ("mutation", np.float64),
+                        ("evaluation", np.float64), ("elapsed", np.float64), ("evaluations", np.int64)])
+
+class RunController:
+    def __init__(self, window: int = 20, best_tol: float = 1e-9, std_tol: float = None, max_time: float = None,
+                 max_evaluations: int = None, max_generations: int = G):
+        if max_generations < 1:
+            raise ValueError(f"max_generations legalabb 1 kell legyen (kapott: {max_generations})")
+        self.window = window
+        self.best_tol = best_tol
+        self.std_tol = std_tol
+        self.max_time = max_time
+        self.max_evaluations = max_evaluations
+        self.max_generations = max_generations
+
+    # leallasi feltetel az eddigi trace sorok alapjan; None, ha folytatni kell
+    def stop_reason(self, trace: np.ndarray):
+        last = trace[-1]
+        if self.max_time is not None and last["elapsed"] >= self.max_time:
+            return "idokeret"
+        if self.max_evaluations is not None and last["evaluations"] >= self.max_evaluations:
+            return "kiertekelesi keret"
+        if len(trace) > self.window:
+            before = trace[-1 - self.window]
+            if last["best"] - before["best"] <= self.best_tol:
+                return "legjobb fitness stagnal"
+            if self.std_tol is not None and abs(last["std"] - before["std"]) <= self.std_tol:
+                return "szoras stagnal"
+        if len(trace) >= self.max_generations:
+            return "generacioszam"
+        return None
+
+    # futtatas a step generacios fuggvennyel (run_generation_vectorized vagy run_generation_nd)
+    # visszaadja a populaciot, fitness-t, a trace tombot es a leallas okat
+    def run(self, pop: np.ndarray, rng: np.random.Generator, objective=f, step=None, **step_options):
+        step = step or run_generation_vectorized
+        trace = np.zeros(self.max_generations, dtype=TRACE_DTYPE)
+        t_start = time.perf_counter()
+        fitness = objective(pop)
+        evaluations = len(pop)
+        reason = "generacioszam"
+        for gen in range(1, self.max_generations + 1):
+            timings = {}
+            pop, fitness, _ = step(pop, fitness, rng, objective=objective, timings=timings, **step_options)
+            evaluations += len(pop)
+            row = trace[gen - 1]
+            row["gen"] = gen
+            row["best"], row["mean"], row["std"] = fitness.max(), fitness.mean(), fitness.std()
+            for phase in PHASES:
+                row[phase] = timings[phase]
+            row["elapsed"] = time.perf_counter() - t_start
+            row["evaluations"] = evaluations
+            reason = self.stop_reason(trace[:gen])
+            if reason is not None:
+                break
+        return pop, fitness, trace[:gen], reason
+
+def save_trace(trace: np.ndarray, path: str):
+    if path.endswith(".csv"):
+        np.savetxt(path, trace, delimiter=",", header=",".join(trace.dtype.names), comments="",
+                   fmt=["%d"] + ["%.10g"] * 8 + ["%d"])
+    else:
+        np.save(path, trace)
+
+# N, k es mutation_rate hangolasa falioraido szerint: mindegyik beallitas a futasvezerlovel fut,
+# az idokeret es a stagnalasi ablak kozos
+def benchmark_controller(sizes=(50, 500, 5000), ks=(2, 4), rates=(0.02, 0.08), max_time: float = 2.0):
+    print(f"{'N':>6s} {'k':>2s} {'rate':>5s} {'gen':>4s} {'ido (s)':>8s} {'kiert.':>8s} "
+          f"{'legjobb f(x)':>13s} {'sel %':>6s} {'evl %':>6s}  leallas")
+    for n in sizes:
+        for k_ in ks:
+            for rate in rates:
+                rng = np.random.default_rng(random_seed)
+                controller = RunController(window=15, max_time=max_time, max_generations=1000)
+                _, _, trace, reason = controller.run(init_population(n, rng), rng, k=k_, mutation_rate=rate)
+                last = trace[-1]
+                phases = sum(trace[phase].sum() for phase in PHASES)
+                print(f"{n:6d} {k_:2d} {rate:5.2f} {last['gen']:4d} {last['elapsed']:8.3f} {last['evaluations']:8d} "
+                      f"{last['best']:13.8f} {trace['selection'].sum() / phases:6.1%} "
+                      f"{trace['evaluation'].sum() / phases:6.1%}  {reason}")
+
+# celfuggveny interfesz: barmely hivhato, ami egy populacio tombre (n,) vagy (n x dim)
+# egyedenkenti fitness tombot (n,) ad vissza (mint f); a GA fuggvenyek objective parametere ezt varja
+# CachedObjective: korlatos memoizalo cache egy draga celfuggveny kore
+# - kulcs: a genom quantum lepeskozre kerekitett erteke (egesz, illetve tobbdimenzios genomnal a sor bajtjai)
+# - LRU kiszoritas maxsize elem felett; statisztika: hivasok, talalatok, kiertekelesek, kiszoritasok
+# - hivasonkent csak az egyedi, cache-ben nem levo genomok ertekelodnek ki, egyetlen kotegben
+#   (batched=False eseten egyesevel), pool megadasakor chunk_size-os darabokban parhuzamosan
+# a kvantalas miatt egy quantum-nyi kornyezet ugyanazt az erteket kapja (az elso elofordulaset)
+class CachedObjective:
+    def __init__(self, fn, quantum: float = 1e-9, maxsize: int = 1_000_000, batched: bool = True,
+                 pool=None, chunk_size: int = 1024):
+        from collections import OrderedDict
+
+        self.fn = fn
+        self.quantum = quantum
+        self.maxsize = maxsize
+        self.batched = batched
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.cache = OrderedDict()
+        self.stats = {"hivasok": 0, "lekerdezesek": 0, "talalatok": 0, "kiertekelesek": 0, "kiszoritasok": 0}
+
+    def keys(self, x: np.ndarray) -> np.ndarray:
+        q = np.round(x / self.quantum).astype(np.int64)
+        if q.ndim == 1:
+            return q
+        q = np.ascontiguousarray(q)
+        return q.view(np.dtype((np.void, q.dtype.itemsize * q.shape[1]))).ravel()
+
+    def _evaluate(self, x: np.ndarray) -> np.ndarray:
+        if not self.batched:
+            return np.array([float(self.fn(xi[None])[0]) for xi in x])
+        if self.pool is None or len(x) <= self.chunk_size:
+            return np.asarray(self.fn(x), dtype=float)
+        chunks = [x[i:i + self.chunk_size] for i in range(0, len(x), self.chunk_size)]
+        return np.concatenate(list(self.pool.map(self.fn, chunks)))
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        unique_keys, first, inverse = np.unique(self.keys(x), return_index=True, return_inverse=True)
+        values = np.empty(len(unique_keys))
+        cache = self.cache
+        missing = []
+        for i, key in enumerate(unique_keys.tolist()):
+            value = cache.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                cache.move_to_end(key)
+                values[i] = value
+        if missing:
+            missing = np.array(missing)
+            values[missing] = self._evaluate(x[first[missing]])
+            for key, value in zip(unique_keys[missing].tolist(), values[missing].tolist()):
+                cache[key] = value
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+                self.stats["kiszoritasok"] += 1
+
+        self.stats["hivasok"] += 1
+        self.stats["lekerdezesek"] += len(x)
+        self.stats["talalatok"] += len(x) - len(missing)
+        self.stats["kiertekelesek"] += len(missing)
+        return values[inverse.ravel()]
+
+    @property
+    def hit_rate(self) -> float:
+        return self.stats["talalatok"] / max(self.stats["lekerdezesek"], 1)
+
+# cache nelkul vs. cache-sel (kulonbozo kvantalassal) egy draga celfuggvenyen
+def benchmark_cache(n: int = 2000, generations: int = G, repeats: int = 200):
+    import functools
+
+    objective = functools.partial(expensive_f, repeats=repeats)
+    for label, quantum in (("cache nelkul", None), ("cache 1e-9", 1e-9), ("cache 1e-6", 1e-6), ("cache 1e-4", 1e-4)):
+        fn = objective if quantum is None else CachedObjective(objective, quantum=quantum)
+        rng = np.random.default_rng(random_seed)
+        pop = init_population(n, rng)
+        t0 = time.perf_counter()
+        fitness = fn(pop)
+        for _ in range(generations):
+            pop, fitness, logs = run_generation_vectorized(pop, fitness, rng, objective=fn)
+        elapsed = time.perf_counter() - t0
+        line = f"{label:13s}: {elapsed:6.2f} s, legjobb f(x) = {logs['legjobb_fitness_ertek']:.8f}"
+        if quantum is not None:
+            line += (f", talalati arany {fn.hit_rate:6.1%}, kiertekelesek {fn.stats['kiertekelesek']}"
+                     f" / {fn.stats['lekerdezesek']}")
+        print(line)
+
+# sziget modell: tobb fuggetlen populacio (sziget) process poolban, M generacionkent migracioval
+# a populaciok, fitness ertekek es a migransok egyetlen osztott memoria blokkban vannak:
+#   pops (I x n), fitness (I x n), migrants (2 x I x m) - ket puffer, hogy az adott korben
+#   irt migransok ne irjak felul az eppen olvasottakat
+# a szigetek seed-jei a random_seed-bol szarmaznak (SeedSequence.spawn), a veletlengenerator
+# allapota korrol korre visszakerul a szulohoz, igy az eredmeny a workerek szamatol fuggetlen
+# migracio gyuru topologiaban: az i. sziget az (i - 1). sziget legjobb m egyedevel irja felul a legrosszabb m egyedet
+M = 10 # migracios intervallum (generacio)
+
+def _island_views(buffer, n_islands: int, n: int, n_migrants: int):
+    data = np.ndarray((2 * n_islands * n + 2 * n_islands * n_migrants,), dtype=np.float64, buffer=buffer)
+    pops = data[:n_islands * n].reshape(n_islands, n)
+    fitness = data[n_islands * n:2 * n_islands * n].reshape(n_islands, n)
+    migrants = data[2 * n_islands * n:].reshape(2, n_islands, n_migrants)
+    return pops, fitness, migrants
+
+# egy sziget egy kore (M generacio); a process pool worker ezt futtatja
+def _island_epoch(shm_name: str, shape: tuple, island: int, epoch: int, generations: int, rng_state: dict,
+                  k: int, mutation_rate: float, elite: int, objective) -> Tuple[list, dict]:
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        n_islands, n, n_migrants = shape
+        pops, fitness, migrants = _island_views(shm.buf, n_islands, n, n_migrants)
+        rng = np.random.default_rng()
+        rng.bit_generator.state = rng_state
+
+        pop, fit = pops[island].copy(), fitness[island].copy()
+        if epoch > 0 and n_islands > 1 and n_migrants:
+            incoming = migrants[epoch % 2, (island - 1) % n_islands].copy()
+            worst = np.argpartition(fit, n_migrants)[:n_migrants]
+            pop[worst] = incoming
+            fit[worst] = objective(incoming)
+
+        logs = []
+        for _ in range(generations):
+            pop, fit, gen_logs = run_generation_vectorized(pop, fit, rng, k, mutation_rate, elite, objective)
+            logs.append(gen_logs)
+
+        pops[island], fitness[island] = pop, fit
+        if n_migrants:
+            migrants[(epoch + 1) % 2, island] = pop[np.argpartition(fit, n - n_migrants)[n - n_migrants:]]
+        del pops, fitness, migrants
+        return logs, rng.bit_generator.state
+    finally:
+        shm.close()
+
+# sziget modell futtatasa; visszaadja a legjobb x-et, f(x)-et es a szigetenkenti naplokat
+# (szigetenkent generaciok listaja, ugyanazokkal a kulcsokkal, mint run_generation naploja)
+# workers=0 eseten a szigetek a fo folyamatban futnak
+def run_islands(n_islands: int = 4, n: int = N, generations: int = G, migration_interval: int = M,
+                n_migrants: int = 2, workers=None, seed: int = random_seed, objective=f) -> Tuple[float, float, list]:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    shape = (n_islands, n, n_migrants)
+    shm = shared_memory.SharedMemory(create=True, size=8 * (2 * n_islands * n + 2 * n_islands * n_migrants))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        pops, fitness, migrants = _island_views(shm.buf, *shape)
+        rng_states = []
+        for i, child_seed in enumerate(np.random.SeedSequence(seed).spawn(n_islands)):
+            rng = np.random.default_rng(child_seed)
+            pops[i] = init_population(n, rng)
+            fitness[i] = objective(pops[i])
+            rng_states.append(rng.bit_generator.state)
+
+        logs = [[] for _ in range(n_islands)]
+        done, epoch = 0, 0
+        while done < generations:
+            step = min(migration_interval, generations - done)
+            args = [(shm.name, shape, i, epoch, step, rng_states[i], k, mutation_rate, E, objective)
+                    for i in range(n_islands)]
+            if pool is None:
+                results = [_island_epoch(*a) for a in args]
+            else:
+                results = list(pool.map(_island_epoch, *zip(*args)))
+            for i, (island_logs, state) in enumerate(results):
+                logs[i].extend(island_logs)
+                rng_states[i] = state
+            done += step
+            epoch += 1
+
+        best = np.unravel_index(np.argmax(fitness), fitness.shape)
+        best_x, best_f = float(pops[best]), float(fitness[best])
+        del pops, fitness, migrants
+        return best_x, best_f, logs
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        shm.close()
+        shm.unlink()
+
+# draga celfuggveny a skalazasi meresekhez: f ertekei (kerekitesi hibaig), de egyedenkent
+# repeats-szer annyi szamitassal
+def expensive_f(x: np.ndarray, repeats: int = 200) -> np.ndarray:
+    y = np.zeros_like(x)
+    for _ in range(repeats):
+        y += f(x)
+    return y / repeats
+
+# sziget modell skalazasa 1 workertol az osszes magig, rogzitett szigetszammal
+# hatekonysag = T(1) / (p * T(p))
+def benchmark_islands(n_islands: int = 8, n: int = 2000, generations: int = 40):
+    import os
+
+    cores = os.cpu_count() or 1
+    counts = sorted({1, *[2 ** i for i in range(1, cores.bit_length()) if 2 ** i < cores], cores})
+    print(f"{n_islands} sziget, N={n}, G={generations}, M={M}, magok: {cores}")
+    base = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        best_x, best_f, _ = run_islands(n_islands, n, generations, workers=workers, objective=expensive_f)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        print(f"workers = {workers:3d}: {elapsed:7.2f} s, gyorsulas {base / elapsed:5.2f}x, "
+              f"hatekonysag {base / (workers * elapsed):6.1%}, legjobb f(x) = {best_f:.8f} (x = {best_x:.8f})")
+
 # a feladatot elvegzo funkcio
-def main():
+# vectorized=True eseten a generaciok a run_generation_vectorized fuggvennyel allnak elo
+def main(vectorized: bool = False, n: int = N, generations: int = G):
     # veletlenszam generalas a feladatban megadott seed-del
     random.seed(random_seed)
     rng = np.random.default_rng(random_seed)
 
     # kezdeti populacio letrehozasa
-    pop = init_population(N, rng)
+    pop = init_population(n, rng)
 
     # legjobb ertekeket tarolo valtozok inicializalasa
     best_overall_x = None
@@ -106,11 +580,14 @@ def main():
     best_overall_x = float(pop[best_idx])
     best_overall_f = float(fitness[best_idx])
 
-    print(f"Parameterek: N={N}, G={G}, k={k}, mutation_rate={mutation_rate}, random_seed={random_seed}, E={E}")
+    print(f"Parameterek: N={n}, G={generations}, k={k}, mutation_rate={mutation_rate}, random_seed={random_seed}, E={E}")
     print("-" * 60)
 
-    for gen in range(1, G + 1):
-        pop, logs = run_generation(pop, rng)
+    for gen in range(1, generations + 1):
+        if vectorized:
+            pop, fitness, logs = run_generation_vectorized(pop, fitness, rng)
+        else:
+            pop, logs = run_generation(pop, rng, n=n)
 
         # ha az aktualis generacioban jobb megoldast talaltunk, akkor a legjobb ertekeket frissitjuk
         if logs["legjobb_fitness_ertek"] > best_overall_f:
@@ -118,7 +595,7 @@ def main():
             best_overall_x = logs["legjobb_x_ertek"]
 
         # minden 10. generacioban naplozunk
-        if gen % 10 == 0 or gen == 1 or gen == G:
+        if gen % 10 == 0 or gen == 1 or gen == generations:
             print(f"Gen {gen:3d}: best f(x) = {logs['legjobb_fitness_ertek']:.6f}, "
                   f"avg = {logs['atlagos_fitness_ertek']:.6f}, std = {logs['fitness_ertekek_szorasa']:.6f}, "
                   f"best x = {logs['legjobb_x_ertek']:.6f}")
@@ -128,7 +605,57 @@ def main():
     print(f"Legjobb x: {best_overall_x:.8f}")
     print(f"Legjobb f(x): {best_overall_f:.8f}")
 
-main()
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectorized", action="store_true", help="vektorizalt generacios lepes")
+    parser.add_argument("-N", type=int, default=N, help="populaciomeret")
+    parser.add_argument("-G", type=int, default=G, help="generaciok szama")
+    parser.add_argument("--bench", action="store_true", help="soros vs. vektorizalt generacio ideje")
+    parser.add_argument("--until-stall", action="store_true", help="futas korai leallitassal (RunController)")
+    parser.add_argument("--window", type=int, default=20, help="stagnalasi ablak (generacio)")
+    parser.add_argument("--max-time", type=float, help="idokeret masodpercben")
+    parser.add_argument("--max-evaluations", type=int, help="kiertekelesi keret")
+    parser.add_argument("--trace", help="generacionkenti meresek mentese (.npy vagy .csv)")
+    parser.add_argument("--tune", action="store_true", help="N, k, mutation_rate hangolasa falioraido szerint")
+    parser.add_argument("--bench-nd", action="store_true", help="tobbdimenzios GA ideje Rastrigin/Rosenbrock fuggvenyen")
+    parser.add_argument("--bench-cache", action="store_true", help="fitness cache hatasa draga celfuggvenyen")
+    parser.add_argument("--islands", type=int, help="sziget modell a megadott szamu szigettel")
+    parser.add_argument("--bench-islands", action="store_true", help="sziget modell skalazasa")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark_generation()
+    elif args.tune:
+        benchmark_controller()
+    elif args.until_stall:
+        rng = np.random.default_rng(random_seed)
+        controller = RunController(window=args.window, max_time=args.max_time,
+                                   max_evaluations=args.max_evaluations, max_generations=args.G)
+        pop, fitness, trace, reason = controller.run(init_population(args.N, rng), rng)
+        best = int(np.argmax(fitness))
+        print(f"leallas: {reason}, {len(trace)} generacio, {trace[-1]['elapsed']:.4f} s, "
+              f"{trace[-1]['evaluations']} kiertekeles")
+        for phase in PHASES:
+            print(f"  {phase:10s}: {trace[phase].sum() * 1000:8.3f} ms")
+        print(f"Legjobb x: {pop[best]:.8f}")
+        print(f"Legjobb f(x): {fitness[best]:.8f}")
+        if args.trace:
+            save_trace(trace, args.trace)
+    elif args.bench_nd:
+        benchmark_nd()
+    elif args.bench_cache:
+        benchmark_cache()
+    elif args.bench_islands:
+        benchmark_islands()
+    elif args.islands:
+        best_x, best_f, logs = run_islands(args.islands, args.N, args.G)
+        for i, island_logs in enumerate(logs):
+            print(f"sziget {i}: best f(x) = {island_logs[-1]['legjobb_fitness_ertek']:.6f}, "
+                  f"avg = {island_logs[-1]['atlagos_fitness_ertek']:.6f}")
+        print(f"Legjobb x: {best_x:.8f}")
+        print(f"Legjobb f(x): {best_f:.8f}")
+    else:
+        main(vectorized=args.vectorized, n=args.N, generations=args.G)
 
 # kerdesek:
 # A futtatas soran megfigyelheto volt, hogy a populacio legjobb es atlagos fitness erteke
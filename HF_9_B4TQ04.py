@@ -1,4 +1,5 @@
 ﻿from math import sqrt
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.dummy import DummyRegressor
@@ -21,12 +22,535 @@ def prepare_data_and_target(df):
     y = df['median_house_value'].values
     return x, y, list(df.drop(columns=['median_house_value']).columns)
 
-def main():
+# gyors, tipusos betoltes: csak a szukseges (numerikus) oszlopok, dtype tipussal olvasva
+# (alapesetben float64, igy a metrikak egyeznek a pandas-os betoltessel; float32 csak keresre,
+# fele akkora memoria mellett a KNN metrikak az utolso tizedesekben elterhetnek)
+# a NaN ertekek az oszlop mediananal toltodnek ki (mint prepare_data_and_target-ben), masolat nelkul
+# az eredmeny matrix (jellemzok + celertek utolso oszlopkent) .npy fajlba kerul, a csv eleresi utja,
+# merete es modositasi ideje (hash_content=True eseten a tartalom hash-e) alapjan kulcsolva;
+# ujrafuttataskor a csv feldolgozasa kimarad, a matrix memoriaba lekepezve (mmap) toltodik be
+FEATURE_COLUMNS = ['longitude', 'latitude', 'housing_median_age', 'total_rooms', 'total_bedrooms',
+                   'population', 'households', 'median_income']
+TARGET_COLUMN = 'median_house_value'
+
+def housing_cache_key(path, hash_content=False, dtype=np.float64):
+    import hashlib
+    import os
+
+    digest = hashlib.sha1(",".join(FEATURE_COLUMNS + [TARGET_COLUMN, np.dtype(dtype).str]).encode())
+    if hash_content:
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+# a pyarrow csv olvaso tobbszalu; ha nincs telepitve, a pandas C olvasoja fut
+def parse_housing(path, dtype=np.float64):
+    import importlib.util
+
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    engine = "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+    df = pd.read_csv(path, usecols=columns, dtype={c: dtype for c in columns}, engine=engine)
+    data = df[columns].to_numpy(dtype=dtype)
+    missing = np.isnan(data)
+    if missing.any():
+        rows, cols = np.nonzero(missing)
+        data[rows, cols] = np.nanmedian(data, axis=0)[cols]
+    return data
+
+# visszaadja: x (dtype tipusu, csak olvashato mmap, ha cache-bol jon), y, jellemzok neve
+def load_housing(path="housing.csv", cache_dir=None, use_cache=True, hash_content=False, dtype=np.float64):
+    import os
+    import tempfile
+
+    if not use_cache:
+        data = parse_housing(path, dtype)
+    else:
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), "housing_cache")
+        cache_path = os.path.join(cache_dir, housing_cache_key(path, hash_content, dtype) + ".npy")
+        if not os.path.exists(cache_path):
+            data = parse_housing(path, dtype)
+            os.makedirs(cache_dir, exist_ok=True)
+            # atomi csere: egy felbemaradt iras ne hagyjon serult cache fajlt
+            tmp_path = cache_path + f".{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fh:
+                np.save(fh, data)
+            os.replace(tmp_path, cache_path)
+        data = np.load(cache_path, mmap_mode="r")
+    return data[:, :-1], data[:, -1], list(FEATURE_COLUMNS)
+
+# betoltes merese kulon folyamatokban (hideg / meleg cache), scale-szeres meretu csv-n
+# modok: pandas (eredeti: read_csv + prepare_data_and_target), typed (tipusos feldolgozas, cache nelkul),
+# cold (tipusos feldolgozas + cache iras), warm (cache betoltes mmap-pel)
+def benchmark_loader(path="housing.csv", scale=100, dtype=np.float64):
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    work_dir = os.path.join(tempfile.gettempdir(), "housing_bench")
+    os.makedirs(work_dir, exist_ok=True)
+    big_path = os.path.join(work_dir, f"housing_x{scale}.csv")
+    if not os.path.exists(big_path):
+        with open(path, "rb") as src:
+            header = src.readline()
+            body = src.read()
+        if not body.endswith(b"\n"):
+            body += b"\n"
+        with open(big_path, "wb") as dst:
+            dst.write(header)
+            for _ in range(scale):
+                dst.write(body)
+    cache_dir = os.path.join(work_dir, "cache")
+    for name in os.listdir(cache_dir) if os.path.exists(cache_dir) else []:
+        os.remove(os.path.join(cache_dir, name))
+
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    script = """
+import resource, sys, time
+sys.path.insert(0, {module_dir!r})
+import {module} as hf
+mode = sys.argv[1]
+t0 = time.perf_counter()
+if mode == "pandas":
+    x, y, _ = hf.prepare_data_and_target(hf.pd.read_csv({big_path!r}))
+else:
+    x, y, _ = hf.load_housing({big_path!r}, cache_dir={cache_dir!r}, use_cache=(mode != "typed"), dtype={dtype!r})
+checksum = float(x[:, 0].sum() + y.sum())
+elapsed = time.perf_counter() - t0
+rss = {{}}
+for line in open("/proc/self/status"):
+    if line.startswith(("RssAnon", "RssFile")):
+        rss[line.split(":")[0]] = int(line.split()[1]) / 1024
+print(f"{{elapsed:.3f}} {{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}} "
+      f"{{rss.get('RssAnon', 0):.1f}} {{rss.get('RssFile', 0):.1f}} {{x.shape[0]}} {{x.dtype}}")
+""".format(module_dir=module_dir, module=module, big_path=big_path, cache_dir=cache_dir,
+           dtype=np.dtype(dtype).name)
+
+    print(f"csv: {big_path} ({os.path.getsize(big_path) / 2**20:.0f} MiB)")
+    for mode in ("pandas", "typed", "cold", "warm"):
+        out = subprocess.run([sys.executable, "-c", script, mode], capture_output=True, text=True, check=True).stdout
+        elapsed, peak, anon, file_rss, rows, dtype = out.split()
+        print(f"{mode:7s}: {float(elapsed):7.3f} s, csucs RSS {float(peak):7.1f} MiB "
+              f"(RssAnon {float(anon):7.1f} MiB, RssFile {float(file_rss):6.1f} MiB), {rows} sor, {dtype}")
+
+# szomszedkereso backendek a KNN regresszorhoz; kozos interfesz:
+#   fit(x) -> self, kneighbors(q, k) -> (tavolsagok, indexek), mindketto (len(q) x k), novekvo tavolsag szerint
+# - TreeIndex: sklearn KD-fa / Ball-fa
+# - BlockedBruteIndex: pontos kereses float32-ben, blokkonkenti tavolsagmatrixszal (korlatos memoria)
+# - IVFIndex: kozelito kereses, k-means klaszterekre bontott (inverted file) tanitohalmaz,
+#   a lekerdezes csak az n_probe legkozelebbi klaszter elemeit vizsgalja
+class TreeIndex:
+    def __init__(self, kind="kd_tree", leaf_size=40):
+        self.kind = kind
+        self.leaf_size = leaf_size
+
+    def fit(self, x):
+        from sklearn.neighbors import BallTree, KDTree
+
+        tree_cls = KDTree if self.kind == "kd_tree" else BallTree
+        self.tree = tree_cls(np.asarray(x), leaf_size=self.leaf_size)
+        return self
+
+    def kneighbors(self, q, k):
+        return self.tree.query(np.asarray(q), k=k)
+
+# negyzetes tavolsag: |q|^2 - 2 q.x + |x|^2, a (blokk x n) matrix memory_mb-nal nem nagyobb
+# kivalasztas ket lepesben: a sorokat chunk hosszu szeletekre bontva a k legkisebb szeletminimumu
+# szelet biztosan tartalmazza a k legkozelebbi pontot, igy az argpartition csak k * chunk elemen fut
+# (a tanitohalmaz +inf tavolsagu pontokkal chunk tobbszorosere van kiegeszitve)
+class BlockedBruteIndex:
+    def __init__(self, memory_mb=256, chunk=64):
+        self.memory_mb = memory_mb
+        self.chunk = chunk
+
+    def fit(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        self.n = len(x)
+        padded = -self.n % self.chunk
+        self.x = np.concatenate([x, np.zeros((padded, x.shape[1]), dtype=np.float32)]) if padded else x
+        self.sq_norms = np.einsum("ij,ij->i", self.x, self.x)
+        self.sq_norms[self.n:] = np.inf
+        return self
+
+    def _select(self, out, k):
+        n_chunks = out.shape[1] // self.chunk
+        if k == 1:
+            return out.argmin(axis=1)[:, None]
+        if n_chunks <= 4 * k:
+            return np.argpartition(out, k - 1, axis=1)[:, :k]
+        chunk_min = out.reshape(len(out), n_chunks, self.chunk).min(axis=2)
+        chunks = np.argpartition(chunk_min, k - 1, axis=1)[:, :k]
+        candidates = (chunks[:, :, None] * self.chunk + np.arange(self.chunk)).reshape(len(out), -1)
+        best = np.argpartition(np.take_along_axis(out, candidates, axis=1), k - 1, axis=1)[:, :k]
+        return np.take_along_axis(candidates, best, axis=1)
+
+    def kneighbors(self, q, k):
+        q = np.ascontiguousarray(q, dtype=np.float32)
+        n = len(self.x)
+        block = max(1, self.memory_mb * 2**20 // (4 * n))
+        dist = np.empty((len(q), k), dtype=np.float32)
+        idx = np.empty((len(q), k), dtype=np.int64)
+        d2 = np.empty((min(block, len(q)), n), dtype=np.float32)
+        for start in range(0, len(q), block):
+            qb = q[start:start + block]
+            out = d2[:len(qb)]
+            # |q|^2 soronkent allando, a rangsort nem befolyasolja: csak a kivalasztott k elemhez adodik hozza
+            np.matmul(qb * -2.0, self.x.T, out=out)
+            out += self.sq_norms
+            part = self._select(out, k)
+            part_d = np.take_along_axis(out, part, axis=1) + np.einsum("ij,ij->i", qb, qb)[:, None]
+            order = np.argsort(part_d, axis=1)
+            idx[start:start + len(qb)] = np.take_along_axis(part, order, axis=1)
+            dist[start:start + len(qb)] = np.take_along_axis(part_d, order, axis=1)
+        np.sqrt(np.maximum(dist, 0.0, out=dist), out=dist)
+        return dist, idx
+
+# k-means kozpontok (n_lists db, a tanitohalmaz mintajan nehany Lloyd-iteracioval); a listak a
+# klaszter szerint rendezett tanitopontok, offsets[c]:offsets[c + 1] a c. klaszter
+class IVFIndex:
+    def __init__(self, n_lists=None, n_probe=8, n_iter=10, seed=42):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.seed = seed
+
+    def fit(self, x):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        rng = np.random.default_rng(self.seed)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(x))))
+        sample = x[rng.choice(len(x), size=min(len(x), 64 * n_lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assign = BlockedBruteIndex().fit(centroids).kneighbors(sample, 1)[1][:, 0]
+            counts = np.bincount(assign, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            nonempty = counts > 0
+            centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+        self.quantizer = BlockedBruteIndex().fit(centroids)
+        assign = self.quantizer.kneighbors(x, 1)[1][:, 0]
+        self.order = np.argsort(assign, kind="stable")
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        self.x = x[self.order]
+        self.sq_norms = np.einsum("ij,ij->i", self.x, self.x)
+        return self
+
+    # ha az n_probe legkozelebbi lista egyuttesen k-nal kevesebb pontot tartalmaz, az adott
+    # lekerdezesnel tovabbi (kozeppont szerint kovetkezo) listakat is megvizsgalunk, amig legalabb
+    # k jelolt nem lesz - igy minden sorban k valodi szomszed van
+    def kneighbors(self, q, k):
+        q = np.ascontiguousarray(q, dtype=np.float32)
+        if k > len(self.x):
+            raise ValueError(f"k = {k} nagyobb, mint a tanitopontok szama ({len(self.x)})")
+        n_lists = len(self.offsets) - 1
+        sizes = np.diff(self.offsets)
+        probes = self.quantizer.kneighbors(q, min(self.n_probe, n_lists))[1]
+        short = np.flatnonzero(sizes[probes].sum(axis=1) < k)
+        if len(short):
+            probes = list(probes)
+            ranked = self.quantizer.kneighbors(q[short], n_lists)[1]
+            needed = (np.cumsum(sizes[ranked], axis=1) < k).sum(axis=1) + 1
+            for i, lists, m in zip(short, ranked, needed):
+                probes[i] = lists[:m]
+        dist = np.empty((len(q), k), dtype=np.float32)
+        idx = np.empty((len(q), k), dtype=np.int64)
+        for i, lists in enumerate(probes):
+            candidates = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in lists])
+            d2 = self.sq_norms[candidates] - 2.0 * (self.x[candidates] @ q[i]) + q[i] @ q[i]
+            best = np.argpartition(d2, k - 1)[:k] if k < len(candidates) else np.arange(k)
+            best = best[np.argsort(d2[best])]
+            dist[i] = np.sqrt(np.maximum(d2[best], 0.0))
+            idx[i] = self.order[candidates[best]]
+        return dist, idx
+
+NEIGHBOUR_BACKENDS = {
+    "kd_tree": lambda: TreeIndex("kd_tree"),
+    "ball_tree": lambda: TreeIndex("ball_tree"),
+    "brute_f32": BlockedBruteIndex,
+    "ivf": IVFIndex,
+}
+
+# KNN regresszio tetszoleges szomszedkereso backenddel (egyenlo sulyokkal, mint KNeighborsRegressor)
+class IndexedKNNRegressor:
+    def __init__(self, index, n_neighbors=5):
+        self.index = index
+        self.n_neighbors = n_neighbors
+
+    def fit(self, x, y):
+        self.index.fit(x)
+        self.y = np.asarray(y, dtype=np.float64)
+        return self
+
+    def predict(self, x):
+        _, idx = self.index.kneighbors(x, self.n_neighbors)
+        return self.y[idx].mean(axis=1)
+
+# backendek osszehasonlitasa: epitesi ido, lekerdezes/s, recall@5 a pontos (sklearn brute) kereseshez
+# kepest es R2; scale > 1 eseten a tanitohalmaz kis zajjal megsokszorozva (nagy adathalmaz szimulalasa)
+def benchmark_backends(scale=1, k=5, seed=42):
+    import time
+
+    x, y, _ = load_housing("housing.csv")
+    x_train, x_test, y_train, y_test = train_test_split(x, y.astype(np.float64), test_size=0.2, random_state=42)
+    scaler = StandardScaler().fit(x_train)
+    x_train = scaler.transform(x_train)
+    x_test = scaler.transform(x_test)
+    if scale > 1:
+        rng = np.random.default_rng(seed)
+        x_train = np.concatenate([x_train] + [x_train + rng.normal(0, 0.05, x_train.shape).astype(x_train.dtype)
+                                              for _ in range(scale - 1)])
+        y_train = np.tile(y_train, scale)
+    print(f"tanitohalmaz: {x_train.shape}, teszthalmaz: {x_test.shape}")
+
+    t0 = time.perf_counter()
+    exact = KNeighborsRegressor(n_neighbors=k, algorithm="brute").fit(x_train, y_train)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _, reference = exact.kneighbors(x_test)
+    query = time.perf_counter() - t0
+    r2_exact = r2_score(y_test, y_train[reference].mean(axis=1))
+    print(f"{'sklearn brute':13s}: epites {build:7.3f} s, {len(x_test) / query:9.0f} lekerdezes/s, "
+          f"recall@{k} 1.0000, R2 {r2_exact:.4f}")
+
+    for name, factory in NEIGHBOUR_BACKENDS.items():
+        model = IndexedKNNRegressor(factory(), n_neighbors=k)
+        t0 = time.perf_counter()
+        model.fit(x_train, y_train)
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        _, idx = model.index.kneighbors(x_test, k)
+        query = time.perf_counter() - t0
+        recall = np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(idx, reference)])
+        r2 = r2_score(y_test, y_train[idx].mean(axis=1))
+        print(f"{name:13s}: epites {build:7.3f} s, {len(x_test) / query:9.0f} lekerdezes/s, "
+              f"recall@{k} {recall:.4f}, R2 {r2:.4f} (valtozas {r2 - r2_exact:+.4f})")
+
+    # ellenorzes: egyetlen vizsgalt lista es a listak atlagos meretenel nagyobb k mellett is
+    # minden sorban k kulonbozo, valodi szomszed kell legyen (nem inf tavolsag / kitoltes)
+    ivf = IVFIndex(n_probe=1).fit(x_train)
+    big_k = 4 * int(np.diff(ivf.offsets).mean()) + 1
+    dist, idx = ivf.kneighbors(x_test[:200], big_k)
+    complete = np.isfinite(dist).all() and all(len(np.unique(row)) == big_k for row in idx)
+    print(f"ivf n_probe=1, k={big_k}: {'minden sor teljes' if complete else 'HIANYOS SZOMSZEDSAG'}")
+
+# betanitott modell (skalazo + KNN + KD-fa index) mentese es gyors betoltese
+# a konyvtarban: mean.npy, scale.npy (StandardScaler), y.npy (celertekek, mmap-pel toltodik be),
+# tree.pickle (scipy cKDTree a skalazott tanitohalmazon), meta.json
+# predict_one / predict: egy sor vagy mikrokoteg, sklearn bemenet-ellenorzes nelkul; a cKDTree
+# lekerdezese nem vegez check_array-t (az sklearn KDTree.query idejenek nagy resze az), a
+# szomszedok a vizsgalt adaton megegyeznek KNeighborsRegressor-eval
+class HousingPredictor:
+    def __init__(self, mean, scale, y, tree, n_neighbors=5, feature_names=None):
+        # a kis tombok sima ndarray-kent: a memmap alosztaly muveletei lassabbak
+        self.mean = np.array(mean, dtype=np.float64)
+        self.scale = np.array(scale, dtype=np.float64)
+        self.inv_scale = 1.0 / self.scale
+        self.y = np.asarray(y)
+        self.tree = tree
+        self.n_neighbors = n_neighbors
+        self.feature_names = feature_names or list(FEATURE_COLUMNS)
+
+    @classmethod
+    def fit(cls, x_train, y_train, n_neighbors=5, leafsize=30):
+        scaler = StandardScaler().fit(x_train)
+        return cls.from_scaled(scaler.mean_, scaler.scale_, scaler.transform(x_train), y_train, n_neighbors, leafsize)
+
+    # mar betanitott skalazo parameterei (mean_, scale_) es a vele skalazott tanitohalmaz alapjan,
+    # ujraskalazas nelkul: ugyanazt a modellt menti, amit a hivo kiertekelt
+    @classmethod
+    def from_scaled(cls, mean, scale, x_train_scaled, y_train, n_neighbors=5, leafsize=30):
+        from scipy.spatial import cKDTree
+
+        tree = cKDTree(np.asarray(x_train_scaled, dtype=np.float64), leafsize=leafsize)
+        return cls(mean, scale, np.asarray(y_train, dtype=np.float64), tree, n_neighbors)
+
+    def save(self, path):
+        import json
+        import os
+        import pickle
+
+        os.makedirs(path, exist_ok=True)
+        for name in ("mean", "scale", "y"):
+            np.save(os.path.join(path, name + ".npy"), getattr(self, name))
+        with open(os.path.join(path, "tree.pickle"), "wb") as fh:
+            pickle.dump(self.tree, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(path, "meta.json"), "w") as fh:
+            json.dump({"n_neighbors": self.n_neighbors, "feature_names": self.feature_names}, fh)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        import json
+        import os
+        import pickle
+
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode) for name in ("mean", "scale", "y")}
+        with open(os.path.join(path, "tree.pickle"), "rb") as fh:
+            tree = pickle.load(fh)
+        with open(os.path.join(path, "meta.json")) as fh:
+            meta = json.load(fh)
+        return cls(arrays["mean"], arrays["scale"], arrays["y"], tree, meta["n_neighbors"], meta["feature_names"])
+
+    # mikrokoteg: (n x 8) sor, nyers (skalazatlan) jellemzok
+    def predict(self, rows):
+        rows = (np.asarray(rows, dtype=np.float64).reshape(-1, len(self.mean)) - self.mean) * self.inv_scale
+        _, idx = self.tree.query(rows, k=self.n_neighbors)
+        return self.y[idx].mean(axis=1)
+
+    # egyetlen sor (8 jellemzo), float eredmeny
+    def predict_one(self, row):
+        _, idx = self.tree.query((np.asarray(row, dtype=np.float64) - self.mean) * self.inv_scale, k=self.n_neighbors)
+        return float(self.y[idx].mean())
+
+# egysoros elorejelzes kesleltetese: skalazas + knn.predict vs. HousingPredictor (p50 / p99),
+# valamint ujratanitas vs. mentett modell betoltese
+def benchmark_predict(n_queries=2000, model_dir=None):
+    import os
+    import tempfile
+    import time
+
+    x, y, _ = load_housing("housing.csv")
+    x_train, x_test, y_train, y_test = train_test_split(x, y.astype(np.float64), test_size=0.2, random_state=42)
+
+    t0 = time.perf_counter()
+    scaler = StandardScaler().fit(x_train)
+    knn = KNeighborsRegressor(n_neighbors=5).fit(scaler.transform(x_train), y_train)
+    fit_time = time.perf_counter() - t0
+    model_dir = model_dir or os.path.join(tempfile.gettempdir(), "housing_model")
+    HousingPredictor.fit(x_train, y_train).save(model_dir)
+    t0 = time.perf_counter()
+    predictor = HousingPredictor.load(model_dir)
+    load_time = time.perf_counter() - t0
+    print(f"ujratanitas (skalazo + knn): {fit_time * 1000:.1f} ms, mentett modell betoltese: {load_time * 1000:.1f} ms")
+
+    reference = knn.predict(scaler.transform(x_test))
+    print(f"max elteres a knn.predict-tol: {np.abs(predictor.predict(x_test) - reference).max():.6f}")
+
+    rows = x_test[:n_queries]
+    row_lists = rows.tolist()
+    for label, fn in (("knn.predict", lambda i: knn.predict(scaler.transform(rows[i:i + 1]))[0]),
+                      ("predict_one", lambda i: predictor.predict_one(row_lists[i])),
+                      ("predict (1 sor)", lambda i: predictor.predict(rows[i])[0])):
+        latencies = np.empty(len(rows))
+        for i in range(len(rows)):
+            t0 = time.perf_counter()
+            fn(i)
+            latencies[i] = time.perf_counter() - t0
+        latencies *= 1e6
+        print(f"{label:16s}: p50 {np.percentile(latencies, 50):7.1f} us, p99 {np.percentile(latencies, 99):7.1f} us")
+    for batch in (8, 64):
+        t0 = time.perf_counter()
+        for start in range(0, len(rows), batch):
+            predictor.predict(rows[start:start + batch])
+        per_row = (time.perf_counter() - t0) / len(rows) * 1e6
+        print(f"predict ({batch:2d} soros mikrokoteg): {per_row:6.1f} us/sor")
+
+# hiperparameter-hangolas keresztvalidacioval: foldonkent egyszer szamoljuk ki a k_max legkozelebbi
+# szomszedot (ugyanaz a KD-fa, mint KNeighborsRegressor-nal), es ebbol a tablabol kapjuk meg minden
+# k <= k_max es uniform / distance sulyozas elorejelzeset kumulalt osszegekkel, ujratanitas nelkul
+# distance sulyozas: w = 1 / d; ha a k szomszed kozott 0 tavolsagu is van, csak azok szamitanak (mint sklearn-ben)
+WEIGHTINGS = ("uniform", "distance")
+
+# egy fold: visszaadja a (k_max x sulyozas x [MAE, MSE, RMSE, R2]) metrika tombot
+def _tune_fold(x, y, train_idx, val_idx, k_max):
+    from sklearn.neighbors import NearestNeighbors
+
+    scaler = StandardScaler().fit(x[train_idx])
+    nn = NearestNeighbors(n_neighbors=k_max).fit(scaler.transform(x[train_idx]))
+    dist, idx = nn.kneighbors(scaler.transform(x[val_idx]))
+    y_nb = y[train_idx][idx]
+    y_val = y[val_idx]
+    counts = np.arange(1, k_max + 1)
+
+    uniform = np.cumsum(y_nb, axis=1) / counts
+    zero = dist == 0
+    w = np.divide(1.0, dist, out=np.zeros_like(dist), where=~zero)
+    zero_count = np.cumsum(zero, axis=1)
+    weighted = np.cumsum(w * y_nb, axis=1) / np.where(zero_count > 0, 1.0, np.cumsum(w, axis=1))
+    exact_hits = np.cumsum(zero * y_nb, axis=1) / np.maximum(zero_count, 1)
+    distance = np.where(zero_count > 0, exact_hits, weighted)
+
+    metrics = np.empty((k_max, len(WEIGHTINGS), 4))
+    ss_tot = np.sum((y_val - y_val.mean()) ** 2)
+    for j, pred in enumerate((uniform, distance)):
+        err = pred - y_val[:, None]
+        mse = np.mean(err ** 2, axis=0)
+        metrics[:, j, 0] = np.mean(np.abs(err), axis=0)
+        metrics[:, j, 1] = mse
+        metrics[:, j, 2] = np.sqrt(mse)
+        metrics[:, j, 3] = 1.0 - mse * len(y_val) / ss_tot
+    return metrics
+
+# hangolas a tanito reszen (ugyanaz a felosztas, mint main-ben), foldok process poolban (workers=0: soros)
+# visszaadja a foldokra atlagolt metrika tombot; compare_naive=True eseten a hagyomanyos
+# (konfiguracionkent ujratanito) keresztvalidacio idejet is megmeri
+def tune_knn(k_max=30, folds=5, workers=None, seed=42, compare_naive=False):
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from sklearn.model_selection import KFold
+
+    x, y, _ = load_housing("housing.csv")
+    x_train, _, y_train, _ = train_test_split(x, y.astype(np.float64), test_size=0.2, random_state=42)
+    x_train = np.ascontiguousarray(x_train)
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=seed).split(x_train))
+
+    t0 = time.perf_counter()
+    args = [(x_train, y_train, train_idx, val_idx, k_max) for train_idx, val_idx in splits]
+    if workers == 0:
+        results = [_tune_fold(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_tune_fold, *zip(*args)))
+    metrics = np.mean(results, axis=0)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{folds}-szoros keresztvalidacio, k = 1..{k_max}, sulyozas: {', '.join(WEIGHTINGS)}")
+    print(f"{'k':>3s} {'weights':>9s} {'MAE':>12s} {'MSE':>16s} {'RMSE':>12s} {'R2':>8s}")
+    for k_ in range(1, k_max + 1):
+        for j, weights in enumerate(WEIGHTINGS):
+            mae, mse, rmse, r2 = metrics[k_ - 1, j]
+            print(f"{k_:3d} {weights:>9s} {mae:12.4f} {mse:16.4f} {rmse:12.4f} {r2:8.4f}")
+    best_k, best_j = np.unravel_index(np.argmax(metrics[:, :, 3]), metrics.shape[:2])
+    print(f"legjobb (R2 szerint): k = {best_k + 1}, weights = {WEIGHTINGS[best_j]}, "
+          f"R2 = {metrics[best_k, best_j, 3]:.4f}, RMSE = {metrics[best_k, best_j, 2]:.4f}")
+    print(f"ido (egy szomszedtabla foldonkent): {elapsed:.2f} s")
+
+    if compare_naive:
+        t0 = time.perf_counter()
+        naive = np.empty((k_max, len(WEIGHTINGS)))
+        for k_ in range(1, k_max + 1):
+            for j, weights in enumerate(WEIGHTINGS):
+                scores = []
+                for train_idx, val_idx in splits:
+                    scaler = StandardScaler().fit(x_train[train_idx])
+                    model = KNeighborsRegressor(n_neighbors=k_, weights=weights)
+                    model.fit(scaler.transform(x_train[train_idx]), y_train[train_idx])
+                    scores.append(r2_score(y_train[val_idx], model.predict(scaler.transform(x_train[val_idx]))))
+                naive[k_ - 1, j] = np.mean(scores)
+        naive_time = time.perf_counter() - t0
+        print(f"ido (konfiguracionkent ujratanitva): {naive_time:.2f} s, "
+              f"max R2 elteres: {np.abs(naive - metrics[:, :, 3]).max():.2e}")
+    return metrics
+
+# backend=None eseten az eredeti KNeighborsRegressor, egyebkent a NEIGHBOUR_BACKENDS valamelyike
+# save_model megadasakor a kiertekelt skalazo + KNN (HousingPredictor) a konyvtarba mentodik; a mentett
+# modell pontos KD-fa keresest vegez, ezert egyedi backenddel (backend != None) nem kombinalhato
+# dtype: a betoltott adatok tipusa (float32: kisebb memoria, de a metrikak kis mertekben elterhetnek)
+def main(backend=None, save_model=None, dtype=np.float64):
     # a csv fajlt helyezzuk el a rootban
-    df = pd.read_csv("housing.csv") # source: https://www.kaggle.com/datasets/camnugent/california-housing-prices
+    # source: https://www.kaggle.com/datasets/camnugent/california-housing-prices
+    if save_model and backend is not None:
+        raise ValueError(f"a mentett modell KD-fat hasznal, a(z) {backend!r} backenddel kiertekelt KNN nem mentheto")
 
-    # adatok elokeszitese
-    x, y, feature_names = prepare_data_and_target(df)
+    # adatok betoltese es elokeszitese (tipusos betoltes, .npy cache-sel)
+    x, y, feature_names = load_housing("housing.csv", dtype=dtype)
+    y = y.astype(np.float64) # a hibametrikak float64-ben osszegzodjenek
 
     # Kért információk kiírása
     print("Dataset: housing.csv (https://www.kaggle.com/datasets/camnugent/california-housing-prices)")
@@ -78,9 +602,14 @@ def main():
 
     # KNN regresszio (k = 5)
     knn = KNeighborsRegressor(n_neighbors=5) # minden elorejelzeshez az 5 legkozelebbi szomszed hasznaalta
+    if backend is not None:
+        knn = IndexedKNNRegressor(NEIGHBOUR_BACKENDS[backend](), n_neighbors=5)
     knn.fit(x_train_scaled, y_train)
     y_pred_knn = knn.predict(x_test_scaled)
 
+    if save_model:
+        HousingPredictor.from_scaled(scaler.mean_, scaler.scale_, x_train_scaled, y_train).save(save_model)
+
     # KNN kiertekelese ugyanugy, mint baseline eseten, csak most a knn elorejelzeseit hasznalva
     mae_knn = mean_absolute_error(y_test, y_pred_knn)
     mse_knn = mean_squared_error(y_test, y_pred_knn)
@@ -101,7 +630,35 @@ def main():
     print(f" - RMSE csökkenés (baseline -> knn): {rmse_base - rmse_knn:.4f}")
     print(f" - R2 változás (baseline -> knn): {r2_knn - r2_base:.4f}")
 
-main()
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bench-load", action="store_true", help="csv betoltes merese (hideg / meleg cache)")
+    parser.add_argument("--backend", choices=sorted(NEIGHBOUR_BACKENDS), help="szomszedkereso backend a KNN-hez")
+    parser.add_argument("--save-model", help="a betanitott modell mentese a megadott konyvtarba")
+    parser.add_argument("--bench-predict", action="store_true", help="egysoros elorejelzes kesleltetese")
+    parser.add_argument("--tune", action="store_true", help="k es sulyozas hangolasa keresztvalidacioval")
+    parser.add_argument("--k-max", type=int, default=30, help="a hangolas legnagyobb k erteke")
+    parser.add_argument("--folds", type=int, default=5, help="keresztvalidacios foldok szama")
+    parser.add_argument("--workers", type=int, help="process pool merete a hangolashoz (0: soros)")
+    parser.add_argument("--compare-naive", action="store_true", help="a hangolas osszevetese az ujratanito modszerrel")
+    parser.add_argument("--bench-backends", action="store_true", help="szomszedkereso backendek osszehasonlitasa")
+    parser.add_argument("--scale", type=int, help="a meresi adat merete az eredeti tobbszorosekent "
+                        "(--bench-load: 100, --bench-backends: 1)")
+    parser.add_argument("--float32", action="store_true", help="adatok betoltese float32-kent (float64 helyett)")
+    args = parser.parse_args()
+    if args.save_model and args.backend:
+        parser.error("--save-model csak az alapertelmezett KNN-nel hasznalhato (--backend nelkul)")
+    if args.bench_load:
+        benchmark_loader(scale=args.scale or 100, dtype=np.float32 if args.float32 else np.float64)
+    elif args.tune:
+        tune_knn(args.k_max, args.folds, args.workers, compare_naive=args.compare_naive)
+    elif args.bench_predict:
+        benchmark_predict()
+    elif args.bench_backends:
+        benchmark_backends(scale=args.scale or 1)
+    else:
+        main(backend=args.backend, save_model=args.save_model, dtype=np.float32 if args.float32 else np.float64)
 
 # kerdesek:
 # javult-e a KNN a baseline-hoz kepest: a fenti szamok alapjan eldontheto,